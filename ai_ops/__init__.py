@@ -70,7 +70,11 @@ class AiOpsConfig(NautobotAppConfig):
     description = "AI Ops integration for Nautobot."
     base_url = "ai-ops"
     required_settings = []
-    default_settings = {}
+    default_settings = {
+        "mcp_client_max_connections": 500,
+        "mcp_client_max_keepalive_connections": 100,
+        "mcp_tool_catalog_dir": "",
+    }
     constance_config = {
         "chat_session_ttl_minutes": ConstanceConfigItem(
             default=10,
@@ -113,7 +117,9 @@ class AiOpsConfig(NautobotAppConfig):
         register_shutdown_handlers()
 
         # NOTE: All default data and scheduled job creation is handled by data migrations
-        # (0006_populate_default_data, 0008_default_scheduled_jobs) so no signals are needed.
+        # (0006_populate_default_data, 0008_default_scheduled_jobs). The signals module
+        # only holds cache-invalidation handlers.
+        from . import signals  # noqa: F401  # pylint: disable=unused-import
 
         # Note: Periodic tasks are handled via Nautobot Jobs (ai_agents.jobs).
         # These jobs can be scheduled through the Nautobot UI for automatic execution.
@@ -131,7 +137,9 @@ class AiOpsConfig(NautobotAppConfig):
         # any Django request loop starts, so the stored connections would be
         # immediately detected as stale and recreated on the first request
         # anyway — making the warmup work pointless.  Those connections are
-        # initialised lazily on the first request instead.
+        # initialised lazily on the first request instead.  Only loop-independent
+        # deep agent state (module imports, parsed subagent YAML, the Langfuse
+        # handler) is warmed alongside the MCP cache.
         #
         # Guards applied before starting the thread:
         #   1. NAUTOBOT_AI_OPS_SKIP_WARMUP=1  — explicit opt-out (useful in CI/test)
@@ -155,12 +163,18 @@ class AiOpsConfig(NautobotAppConfig):
                 import asyncio
 
                 from ai_ops.agents.multi_mcp_agent import warm_mcp_cache
+                from ai_ops.helpers.common.asyncio_utils import install_eager_task_factory
 
                 def _run_startup_warmup() -> None:
+                    # Imported here so the deepagents/LangChain import cost is paid
+                    # by the warmup thread rather than Django startup.
+                    from ai_ops.agents.deep_mcp_agent import warmup_deep_agent_caches
+
                     loop = asyncio.new_event_loop()
                     asyncio.set_event_loop(loop)
+                    install_eager_task_factory(loop)
                     try:
-                        loop.run_until_complete(warm_mcp_cache())
+                        loop.run_until_complete(asyncio.gather(warm_mcp_cache(), warmup_deep_agent_caches()))
                     finally:
                         loop.close()
 
@@ -170,7 +184,7 @@ class AiOpsConfig(NautobotAppConfig):
                     daemon=True,  # won't block interpreter shutdown
                 )
                 warmup_thread.start()
-                logger.info("Started startup warmup thread (MCP cache)")
+                logger.info("Started startup warmup thread (MCP cache, deep agent caches)")
             except Exception as e:
                 # Release the guard so a later process restart can retry.
                 _WARMUP_STARTED.clear()
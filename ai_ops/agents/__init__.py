@@ -1,9 +1,11 @@
 """AI Agent implementations for Nautobot."""
 
 from ai_ops.agents.multi_mcp_agent import (
+    clear_agent_cache,
     clear_mcp_cache,
     get_or_create_mcp_client,
     process_message,
+    stream_message,
     warm_mcp_cache,
 )
 
@@ -14,9 +16,11 @@ from ai_ops.agents.multi_mcp_agent import (
 
 __all__ = [
     # Multi-MCP Agent (Production)
+    "clear_agent_cache",
     "clear_mcp_cache",
     "get_or_create_mcp_client",
     "process_message",
+    "stream_message",
     "warm_mcp_cache",
     # Single-MCP Agent (Legacy/Development)
     # "initialize_agent",
@@ -15,36 +15,64 @@ Observability Configuration:
 """
 
 import asyncio
+import atexit
+import functools
+import hashlib
+import json
 import logging
 import os
+import re
+import threading
 import time
+from collections import OrderedDict
+from contextlib import aclosing
+from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Callable, cast
+from typing import Any, AsyncIterator, Callable, cast
 
-from asgiref.sync import sync_to_async
 from deepagents import CompiledSubAgent, SubAgent, create_deep_agent
 from deepagents.backends import CompositeBackend, FilesystemBackend, StoreBackend
 from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
 from langchain_core.runnables import RunnableConfig
 
 from ai_ops.helpers.deep_agent import (
+    RESPONSE_CACHE_ENABLED,
     ToolErrorHandlerMiddleware,
+    build_response_cache_key,
+    build_subagents,
+    clear_checkpointer_cache,
+    clear_store_cache,
+    close_all_pools,
+    close_all_stores,
+    close_mcp_transport,
+    get_cached_response,
     get_checkpointer,
     get_mcp_tools,
     get_store,
-    load_agents,
+    read_agent_specs,
+    store_cached_response,
 )
-from ai_ops.helpers.get_llm_model import get_llm_model_async
+from ai_ops.helpers.get_llm_model import get_default_model_cached, get_llm_model_async
 from ai_ops.helpers.get_middleware import get_middleware
-from ai_ops.helpers.get_prompt import get_active_prompt
-from ai_ops.helpers.logging_config import (
-    generate_correlation_id,
-    set_user,
-)
+from ai_ops.helpers.get_prompt import aget_cached_active_prompt
+from ai_ops.helpers.logging_config import bind_request_context, stream_in_request_context
 from ai_ops.models import LLMModel
 
-__all__ = ["build_deep_agent", "process_message", "shutdown_deep_agent", "warmup_deep_agent_connections"]
+__all__ = [
+    "AgentSettings",
+    "SETTINGS",
+    "build_deep_agent",
+    "clear_graph_cache",
+    "get_deep_agent",
+    "invalidate_graph_cache",
+    "process_message",
+    "shutdown_deep_agent",
+    "stream_message",
+    "warmup_deep_agent_caches",
+    "warmup_deep_agent_connections",
+]
 
 # ---------------------------------------------------------------------------
 # Module-level configuration
@@ -53,12 +81,83 @@ __all__ = ["build_deep_agent", "process_message", "shutdown_deep_agent", "warmup
 AGENT_NAME = "deep_agent"
 AGENT_DIR = Path(__file__).parent.parent  # ai_ops/ directory
 
-# Execution limits — override via env vars without code changes
-REQUEST_TIMEOUT_SECS: int = int(os.getenv("AGENT_REQUEST_TIMEOUT", "120"))
-RECURSION_LIMIT: int = int(os.getenv("AGENT_RECURSION_LIMIT", "100"))
+# Agent definition files ship with the package and don't change while the
+# process runs — resolve them once at import instead of on every build.
+# Skills/memory paths are virtual paths relative to FilesystemBackend root_dir (AGENT_DIR).
+_SUBAGENTS_PATH: str = str(AGENT_DIR / "agents" / "subagents.yaml")
+_SUBAGENT_SPECS: dict[str, Any] = read_agent_specs(_SUBAGENTS_PATH)
+_SKILLS_PATH: str | None = "/skills" if (AGENT_DIR / "skills").is_dir() else None
+
+
+def _discover_memory_files(memory_dir: Path) -> list[str]:
+    """Return the sorted virtual paths of the ``*.md`` files in ``memory_dir``."""
+    try:
+        # scandir exposes the dirent type, so no per-entry stat (except for
+        # symlinks, which are followed like glob did) or Path objects
+        with os.scandir(memory_dir) as entries:
+            return sorted(
+                f"/memory/{entry.name}" for entry in entries if entry.name.endswith(".md") and entry.is_file()
+            )
+    except FileNotFoundError:
+        return []
+
+
+_MEMORY_FILES: list[str] = _discover_memory_files(AGENT_DIR / "memory")
+
+
+def _env_flag(name: str, default: str = "false") -> bool:
+    """Parse a boolean environment variable."""
+    return os.getenv(name, default).lower() in ("true", "1", "yes", "on")
+
+
+@dataclass(frozen=True, slots=True)
+class AgentSettings:
+    """Deep agent tunables, read from the environment once at import.
+
+    Attributes:
+        request_timeout_secs: Wall-clock limit for one request (``AGENT_REQUEST_TIMEOUT``).
+        recursion_limit: Max graph steps per request (``AGENT_RECURSION_LIMIT``).
+        tool_max_retries: Fallback tool retry count when no DB middleware is
+            configured (``TOOL_MAX_RETRIES``).
+        enable_langfuse: Langfuse observability — opt-in only (``ENABLE_LANGFUSE``).
+        fast_path_enabled: Answer bare greetings / thanks without running the
+            agent (``AGENT_FAST_PATH_ENABLED``).
+        graph_cache_ttl_secs: Compiled graph lifetime; 0 rebuilds on every
+            request (``AGENT_GRAPH_CACHE_TTL``).
+        graph_cache_max_size: Max compiled graphs kept (``AGENT_GRAPH_CACHE_SIZE``).
+    """
+
+    request_timeout_secs: int
+    recursion_limit: int
+    tool_max_retries: int
+    enable_langfuse: bool
+    fast_path_enabled: bool
+    graph_cache_ttl_secs: int
+    graph_cache_max_size: int
+
+    @classmethod
+    def from_env(cls) -> "AgentSettings":
+        """Build settings from environment variables, applying defaults."""
+        return cls(
+            request_timeout_secs=int(os.getenv("AGENT_REQUEST_TIMEOUT", "120")),
+            recursion_limit=int(os.getenv("AGENT_RECURSION_LIMIT", "100")),
+            tool_max_retries=int(os.getenv("TOOL_MAX_RETRIES", "2")),
+            enable_langfuse=_env_flag("ENABLE_LANGFUSE"),
+            fast_path_enabled=_env_flag("AGENT_FAST_PATH_ENABLED"),
+            graph_cache_ttl_secs=int(os.getenv("AGENT_GRAPH_CACHE_TTL", "300")),
+            graph_cache_max_size=int(os.getenv("AGENT_GRAPH_CACHE_SIZE", "32")),
+        )
+
 
-# Langfuse observability — opt-in only; never enabled by default
-ENABLE_LANGFUSE: bool = os.getenv("ENABLE_LANGFUSE", "false").lower() in ("true", "1", "yes", "on")
+SETTINGS = AgentSettings.from_env()
+
+# Tags attached to every agent run (tracing / filtering)
+_RUN_TAGS: tuple[str, ...] = ("deep-agent", "mcp")
+
+# Bare greetings / thanks answered without running the agent (see fast_path_enabled)
+_FAST_PATH_RE = re.compile(r"^\s*(?:(?P<greeting>hi|hello|hey)|(?P<thanks>thanks|thank you))[\s!.?]*$", re.IGNORECASE)
+_FAST_PATH_GREETING = "Hello! How can I help you with Nautobot today?"
+_FAST_PATH_THANKS = "You're welcome! Let me know if there's anything else I can help with."
 
 
 class _AgentLogger(logging.LoggerAdapter):
@@ -76,31 +175,304 @@ class _AgentLogger(logging.LoggerAdapter):
 _log = _AgentLogger(logging.getLogger(__name__), {"name": AGENT_NAME})
 
 
+_langfuse_handler: Any = None
+_langfuse_initialised = False
+# Callbacks list attached to every run; built once alongside the handler
+_langfuse_callbacks: list[Any] | None = None
+# Failed initialisation is retried at most this often, warning only once
+_LANGFUSE_RETRY_SECS = 60.0
+_langfuse_retry_at = 0.0
+_langfuse_failure_logged = False
+
+
 def _get_langfuse_handler():
-    """Return a Langfuse ``CallbackHandler``, or ``None`` if disabled / unavailable.
+    """Return the shared Langfuse ``CallbackHandler``, or ``None`` if disabled / unavailable.
 
     Initialised lazily rather than at module import time so that:
     - Tests that import this module never trigger network connectivity.
     - Missing env vars only raise an issue when the feature is actually used.
 
+    The handler keys its trace state by run id, so a single instance is
+    attached to every run instead of constructing a new one per request.
+
     Returns:
         A ``langfuse.callback.CallbackHandler`` instance, or ``None``.
     """
-    if not ENABLE_LANGFUSE:
+    global _langfuse_handler, _langfuse_initialised, _langfuse_callbacks, _langfuse_retry_at, _langfuse_failure_logged
+    if not SETTINGS.enable_langfuse:
+        return None
+    if _langfuse_initialised:
+        return _langfuse_handler
+    if time.monotonic() < _langfuse_retry_at:
         return None
     try:
+        import httpx
         from langfuse.callback import CallbackHandler
 
-        return CallbackHandler(
+        # Events are queued and shipped in batches by a background worker over
+        # one keep-alive connection pool, instead of a POST per callback.
+        _langfuse_handler = CallbackHandler(
             public_key=os.getenv("LANGFUSE_PUBLIC_KEY"),
             secret_key=os.getenv("LANGFUSE_SECRET_KEY"),
             host=os.getenv("LANGFUSE_HOST", "http://localhost:3000"),
+            flush_at=int(os.getenv("LANGFUSE_FLUSH_AT", "50")),
+            flush_interval=float(os.getenv("LANGFUSE_FLUSH_INTERVAL", "2.0")),
+            threads=int(os.getenv("LANGFUSE_THREADS", "1")),
+            max_retries=int(os.getenv("LANGFUSE_MAX_RETRIES", "2")),
+            httpx_client=httpx.Client(
+                timeout=float(os.getenv("LANGFUSE_TIMEOUT", "20")),
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            ),
         )
+        # Ship any events still queued when the process exits
+        atexit.register(_langfuse_handler.flush)
+        _langfuse_callbacks = [_langfuse_handler]
+        _langfuse_initialised = True
+        _log.info("Langfuse callback handler initialised")
+        return _langfuse_handler
     except Exception as exc:
-        _log.warning("Failed to initialize Langfuse: %s", exc)
+        _langfuse_retry_at = time.monotonic() + _LANGFUSE_RETRY_SECS
+        if _langfuse_failure_logged:
+            _log.debug("Langfuse still unavailable: %s", exc)
+        else:
+            _langfuse_failure_logged = True
+            _log.warning("Failed to initialize Langfuse, tracing disabled until it recovers: %s", exc)
         return None
 
 
+# ---------------------------------------------------------------------------
+# Compiled graph cache
+# ---------------------------------------------------------------------------
+
+GraphCacheKey = tuple[Any, str | None, str | None]
+
+
+@dataclass
+class GraphCacheEntry:
+    """A compiled graph together with when, and for which configuration, it was built."""
+
+    graph: Any
+    created_at: float
+    generation: int
+
+
+# LRU of compiled graphs keyed by (model pk, provider, token digest)
+_graph_cache: "OrderedDict[GraphCacheKey, GraphCacheEntry]" = OrderedDict()
+# Guards the OrderedDict across threads (sync_to_async/async_to_sync may run
+# several event loops concurrently); never held across an await.
+_graph_cache_lock = threading.Lock()
+# Builds currently in progress, so concurrent cache misses for the same key
+# on the same loop share one build instead of each running their own.
+_graph_builds: dict[tuple[GraphCacheKey, asyncio.AbstractEventLoop, int], "asyncio.Future[Any]"] = {}
+# Bumped whenever the models a graph is built from change (see ai_ops.signals);
+# entries and builds from an older generation are never served.
+_graph_generation = 0
+
+
+def _token_scope(user_token: str | None) -> str | None:
+    """Return the cache scope for a user token.
+
+    The token itself is baked into the MCP tools' HTTP client, so two tokens
+    must never share a graph even when they belong to the same user — a graph
+    built for a revoked token would keep calling MCP servers with it.  Nautobot
+    API tokens are short opaque keys, so a digest of the whole token is both
+    the correct scope and cheap to compute; only the digest is kept so raw
+    tokens never sit in the cache.
+    """
+    if not user_token:
+        return None
+    return hashlib.blake2b(user_token.encode(), digest_size=16).hexdigest()
+
+
+def _graph_cache_key(llm_model: "LLMModel", provider: str | None, user_token: str | None) -> GraphCacheKey:
+    """Build the cache key for a compiled graph, scoped per user token."""
+    return (llm_model.pk, provider, _token_scope(user_token))
+
+
+def _get_cached_graph(key: GraphCacheKey) -> Any | None:
+    """Return the cached graph for ``key`` if it is still fresh."""
+    entry = _graph_cache.get(key)
+    if entry is None:
+        return None
+
+    expired = time.monotonic() - entry.created_at > SETTINGS.graph_cache_ttl_secs
+    if expired or entry.generation != _graph_generation:
+        _graph_cache.pop(key, None)
+        return None
+
+    _graph_cache.move_to_end(key)
+    return entry.graph
+
+
+def _bind_connections(graph: Any, checkpointer: Any, store: Any) -> Any:
+    """Return ``graph`` running against this request's checkpointer and store.
+
+    Only these two connections are bound to an event loop — the compiled
+    nodes, tools and prompt are not — and under WSGI every request runs on a
+    fresh loop.  ``Pregel.copy`` is shallow, so rebinding costs an object
+    allocation rather than a rebuild.
+    """
+    if graph.checkpointer is checkpointer and graph.store is store:
+        return graph
+    return graph.copy(update={"checkpointer": checkpointer, "store": store})
+
+
+def clear_graph_cache() -> int:
+    """Drop every cached compiled graph.
+
+    Returns:
+        Number of graphs that were evicted.
+    """
+    with _graph_cache_lock:
+        count = len(_graph_cache)
+        _graph_cache.clear()
+    if count:
+        _log.info("Cleared %d cached graph(s)", count)
+    return count
+
+
+def invalidate_graph_cache() -> None:
+    """Invalidate every cached graph, including builds that are still running.
+
+    Called when an LLM model, provider, middleware, system prompt or MCP server
+    changes so the next request rebuilds against the new configuration.
+    """
+    global _graph_generation
+    with _graph_cache_lock:
+        _graph_generation += 1
+    clear_graph_cache()
+
+
+async def get_deep_agent(
+    llm_model: "LLMModel | None" = None,
+    provider: str | None = None,
+    user_token: str | None = None,
+) -> Any:
+    """Return a compiled deep agent graph, reusing a cached one when possible.
+
+    Graphs are cached per ``(model, provider, user token)`` for
+    ``AGENT_GRAPH_CACHE_TTL`` seconds.  Conversation state lives in the
+    checkpointer keyed by ``thread_id``, so one compiled graph safely serves
+    many threads.  The cache outlives the request's event loop: a cached graph
+    is rebound to the checkpointer and store of the running loop (see
+    :func:`_bind_connections`), so it is reused under WSGI, where every request
+    runs on a new loop, as well as under ASGI.  Concurrent misses for the same
+    key on the same loop await a single build.
+
+    Args:
+        llm_model: LLMModel instance. If ``None``, the default model is used.
+        provider: Optional LLM provider name override.
+        user_token: Bearer token for MCP authentication.
+
+    Returns:
+        A compiled LangGraph runnable ready for ``ainvoke``.
+    """
+    if llm_model is None:
+        llm_model = await get_default_model_cached()
+
+    if SETTINGS.graph_cache_ttl_secs <= 0:
+        return await build_deep_agent(llm_model=llm_model, provider=provider, user_token=user_token)
+
+    loop = asyncio.get_running_loop()
+    key = _graph_cache_key(llm_model, provider, user_token)
+    # Resolving the connections recreates them for a new loop and runs the
+    # factories' liveness probe (at most every LIVENESS_CHECK_INTERVAL seconds),
+    # so a cached graph never runs against a closed or dead connection
+    checkpointer, store = await asyncio.gather(get_checkpointer(AGENT_NAME), get_store(AGENT_NAME))
+    with _graph_cache_lock:
+        generation = _graph_generation
+        # Builds are shared per loop only: their future is bound to this loop
+        build_key = (key, loop, generation)
+        graph = _get_cached_graph(key)
+        pending = _graph_builds.get(build_key) if graph is None else None
+        if graph is None and pending is None:
+            build = _graph_builds[build_key] = loop.create_future()
+    if graph is not None:
+        _log.debug("Graph cache hit (model=%s)", llm_model.name)
+        return _bind_connections(graph, checkpointer, store)
+    if pending is not None:
+        _log.debug("Joining in-flight graph build (model=%s)", llm_model.name)
+        # Shielded so a cancelled waiter does not cancel the shared build
+        return _bind_connections(await asyncio.shield(pending), checkpointer, store)
+
+    try:
+        graph = await build_deep_agent(llm_model=llm_model, provider=provider, user_token=user_token)
+    except BaseException as exc:
+        with _graph_cache_lock:
+            _graph_builds.pop(build_key, None)
+        if isinstance(exc, Exception):
+            build.set_exception(exc)
+            build.exception()  # waiters re-raise it; don't warn when there are none
+        else:
+            build.cancel()
+        raise
+
+    with _graph_cache_lock:
+        _graph_builds.pop(build_key, None)
+        # A build that raced an invalidation is still returned, just not cached
+        if generation == _graph_generation:
+            _graph_cache[key] = GraphCacheEntry(graph=graph, created_at=time.monotonic(), generation=generation)
+            _graph_cache.move_to_end(key)
+            while len(_graph_cache) > SETTINGS.graph_cache_max_size:
+                _graph_cache.popitem(last=False)
+    build.set_result(graph)
+
+    return graph
+
+
+# Stateless view of the packaged agent files, shared by every graph
+_FILESYSTEM_BACKEND = FilesystemBackend(root_dir=str(AGENT_DIR), virtual_mode=True)
+
+
+def _build_backend(rt: Any) -> CompositeBackend:
+    """Route ``/memories/`` to the per-run store and everything else to the agent files."""
+    return CompositeBackend(default=_FILESYSTEM_BACKEND, routes={"/memories/": StoreBackend(rt)})
+
+
+@functools.lru_cache(maxsize=16)
+def _anthropic_system_message(system_prompt: str) -> SystemMessage:
+    """Return the system prompt as a SystemMessage marked for Anthropic prompt caching.
+
+    Memoised on the prompt text so every graph built for the same prompt shares
+    one message object instead of reallocating the content blocks.
+    """
+    return SystemMessage(
+        content=[
+            {
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"},
+            },
+        ]
+    )
+
+
+def _prompt_prefix_sha(system_prompt_input: SystemMessage | str) -> str:
+    """Return a short digest of the system prompt exactly as it is sent to the model.
+
+    Structured content is hashed in canonical JSON form (sorted keys), so the
+    digest only changes when the cached prefix itself would.
+    """
+    content = system_prompt_input.content if isinstance(system_prompt_input, SystemMessage) else system_prompt_input
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+_fallback_middleware: ToolErrorHandlerMiddleware | None = None
+
+
+def _get_fallback_middleware() -> ToolErrorHandlerMiddleware:
+    """Return the shared env-configured tool error handler.
+
+    It holds no per-request state (only its retry settings), so a single
+    instance is reused by every graph that has no DB middleware configured.
+    """
+    global _fallback_middleware
+    if _fallback_middleware is None:
+        _fallback_middleware = ToolErrorHandlerMiddleware(max_retries=SETTINGS.tool_max_retries)
+    return _fallback_middleware
+
+
 async def build_deep_agent(
     llm_model: "LLMModel | None" = None,
     provider: str | None = None,
@@ -121,73 +493,76 @@ async def build_deep_agent(
         user_token: Bearer token for MCP authentication.
 
     Returns:
-        A compiled LangGraph runnable ready for ``ainvoke``.
+        A compiled LangGraph runnable ready for ``ainvoke``, carrying the
+        ``prompt_prefix_sha`` run metadata. Run-level settings (recursion limit,
+        callbacks) are supplied per invocation by the caller.
 
     Raises:
         Exception: Re-raised if any component (checkpointer, store, graph) fails to initialise.
+            When several components fail concurrently, the first failure is raised
+            and every failure is logged.
     """
-    _log.debug("Building deep agent (user_token=%s)", user_token is not None)
-    _log.info(
-        "[build_deep_agent] user_token_provided=%s token_length=%d",
-        user_token is not None,
-        len(user_token) if user_token else 0,
-    )
+    if _log.isEnabledFor(logging.INFO):
+        _log.info(
+            "[build_deep_agent] user_token_provided=%s token_length=%d",
+            user_token is not None,
+            len(user_token) if user_token else 0,
+        )
 
     try:
         # Resolve LLM model
         if llm_model is None:
-            llm_model = await sync_to_async(LLMModel.get_default_model)()
-
-        llm = await get_llm_model_async(model_name=llm_model.name, provider=provider)
-        _log.info("LLM model initialised: %s", type(llm).__name__)
+            llm_model = await get_default_model_cached()
 
         # Retrieve MCP tools — pass user_token only when present to preserve
         # backwards compatibility with implementations that don't accept the kwarg.
         _log.info("[get_mcp_tools] Retrieving MCP tools (authenticated=%s)", bool(user_token))
         mcp_tool_kwargs: dict = {"user_token": user_token} if user_token else {}
-        mcp_tools = await get_mcp_tools(agent_name=AGENT_NAME, **mcp_tool_kwargs)
-        _log.info("Retrieved %d MCP tools", len(mcp_tools))
 
-        # Checkpointer — connection-pooled
-        try:
-            _log.info("[get_checkpointer] Initialising checkpointer...")
-            checkpointer = await get_checkpointer(AGENT_NAME)
-            _log.info("Checkpointer initialised: %s", type(checkpointer).__name__)
-        except Exception as checkpointer_error:
-            _log.error(
-                "Checkpointer failed: %s: %s",
-                type(checkpointer_error).__name__,
-                checkpointer_error,
-                exc_info=True,
-            )
-            raise
-
-        # Store — cross-conversation memory
-        try:
-            _log.info("[get_store] Initialising store...")
-            store = await get_store(AGENT_NAME)
-            _log.info("Store initialised: %s", type(store).__name__)
-        except Exception as store_error:
-            _log.error(
-                "Store failed: %s: %s",
-                type(store_error).__name__,
-                store_error,
-                exc_info=True,
-            )
-            raise
-
-        # Middleware — loaded fresh from DB to prevent state leaks across requests
-        middleware = await get_middleware(llm_model)
+        # None of these depend on each other — resolve them concurrently so the
+        # cold build costs max(...) of the DB/HTTP/Redis round trips, not sum(...).
+        component_names = ("LLM model", "MCP tools", "Checkpointer", "Store", "Middleware")
+        results = await asyncio.gather(
+            get_llm_model_async(model_name=llm_model.name, provider=provider),
+            get_mcp_tools(agent_name=AGENT_NAME, **mcp_tool_kwargs),
+            get_checkpointer(AGENT_NAME),
+            get_store(AGENT_NAME),
+            get_middleware(llm_model),
+            return_exceptions=True,
+        )
+        failures = [(name, res) for name, res in zip(component_names, results) if isinstance(res, BaseException)]
+        for component_name, error in failures:
+            _log.error("%s failed: %s: %s", component_name, type(error).__name__, error, exc_info=error)
+        if failures:
+            raise failures[0][1]
+
+        llm, mcp_tools, checkpointer, store, middleware = results
+        # Canonical tool order keeps the tool schemas and the rendered prompt —
+        # the prefix Anthropic caches — byte-stable regardless of server order
+        mcp_tools = sorted(mcp_tools, key=attrgetter("name"))
+        _log.info("LLM model initialised: %s", type(llm).__name__)
+        _log.info("Retrieved %d MCP tools", len(mcp_tools))
+        _log.info("Checkpointer initialised: %s", type(checkpointer).__name__)
+        _log.info("Store initialised: %s", type(store).__name__)
+        # Middleware — fresh instances per build; cached graphs share them across
+        # threads, which is safe because per-run state lives in the graph state
         _log.info("Middleware loaded: %d component(s)", len(middleware))
 
         if not middleware:
             _log.warning("No DB middleware configured — falling back to env var defaults")
-            max_retries = int(os.getenv("TOOL_MAX_RETRIES", "2"))
-            middleware.append(ToolErrorHandlerMiddleware(max_retries=max_retries))
-            _log.info("Tool error handler added (max_retries=%d)", max_retries)
+            middleware.append(_get_fallback_middleware())
+            _log.info("Tool error handler added (max_retries=%d)", SETTINGS.tool_max_retries)
 
         # System prompt
-        system_prompt = await sync_to_async(get_active_prompt)(llm_model, tools=mcp_tools)
+        system_prompt = await aget_cached_active_prompt(llm_model, tools=mcp_tools)
+
+        # Subagents — specs are parsed once at import; only the tools are bound here
+        subagents = cast(
+            list[SubAgent | CompiledSubAgent],
+            build_subagents(_SUBAGENT_SPECS, tools={"mcp_tools": mcp_tools}),
+        )
+        _log.info("Subagents loaded: %d", len(subagents))
+
         if not mcp_tools:
             system_prompt += (
                 "\n\nNote: You currently have no tools available. "
@@ -196,81 +571,120 @@ async def build_deep_agent(
 
         # Wrap system prompt for Anthropic prompt-caching
         if isinstance(llm, ChatAnthropic):
-            system_prompt_input = SystemMessage(
-                content=[
-                    {
-                        "type": "text",
-                        "text": system_prompt,
-                        "cache_control": {"type": "ephemeral"},
-                    },
-                ]
-            )
-            _log.info("System prompt wrapped as SystemMessage with cache_control (%d chars)", len(system_prompt))
+            system_prompt_input = _anthropic_system_message(system_prompt)
         else:
             system_prompt_input = system_prompt
-            _log.info("System prompt loaded (%d chars)", len(system_prompt))
-
-        # Subagents
-        subagents_path = AGENT_DIR / "agents" / "subagents.yaml"
-        subagents = cast(
-            list[SubAgent | CompiledSubAgent],
-            await load_agents(str(subagents_path), tools={"mcp_tools": mcp_tools}),
+        prompt_sha = _prompt_prefix_sha(system_prompt_input)
+        _log.info(
+            "System prompt loaded (%d chars, prompt_prefix_sha=%s, cache_control=%s)",
+            len(system_prompt),
+            prompt_sha,
+            isinstance(llm, ChatAnthropic),
         )
-        _log.info("Subagents loaded: %d", len(subagents))
-
-        # Skills — virtual path relative to FilesystemBackend root_dir (AGENT_DIR)
-        skills_dir = AGENT_DIR / "skills"
-        skills_path = "/skills" if skills_dir.exists() else None
-        _log.info("Skills path: %s", skills_path or "<not found>")
-
-        # Memory files — virtual paths relative to FilesystemBackend root_dir (AGENT_DIR)
-        memory_dir = AGENT_DIR / "memory"
-        memory_files = [f"/memory/{f.name}" for f in memory_dir.glob("*.md")] if memory_dir.exists() else []
-        _log.info("Memory files: %d", len(memory_files))
 
         _log.info(
             "Creating deep agent — tools=%d middleware=%d subagents=%d skills=%s memory=%d",
             len(mcp_tools),
             len(middleware),
             len(subagents),
-            skills_path is not None,
-            len(memory_files),
+            _SKILLS_PATH is not None,
+            len(_MEMORY_FILES),
         )
 
-        graph = create_deep_agent(
+        # Graph compilation is synchronous CPU work; run it in a worker thread so
+        # other requests on this loop aren't stalled while it compiles.
+        graph = await asyncio.to_thread(
+            create_deep_agent,
             tools=mcp_tools or [],
             middleware=middleware,
-            memory=memory_files or None,
-            skills=[skills_path] if skills_path else None,
+            memory=_MEMORY_FILES or None,
+            skills=[_SKILLS_PATH] if _SKILLS_PATH else None,
             checkpointer=checkpointer,
             store=store,
-            backend=lambda rt: CompositeBackend(
-                default=FilesystemBackend(root_dir=str(AGENT_DIR), virtual_mode=True),
-                routes={"/memories/": StoreBackend(rt)},
-            ),
+            backend=_build_backend,
             model=llm,
             subagents=subagents or None,
             system_prompt=system_prompt_input,
         )
 
-        # Attach Langfuse callback and set recursion guard.
-        # Callbacks at graph level propagate to all child runnables (including LLM).
-        agent_config = RunnableConfig(recursion_limit=RECURSION_LIMIT)
-        langfuse_handler = _get_langfuse_handler()
-        if langfuse_handler:
-            agent_config["callbacks"] = [langfuse_handler]
-            _log.info("Langfuse callback attached to graph")
-
-        graph = graph.with_config(agent_config)
-        _log.info("Graph configured (recursion_limit=%d)", RECURSION_LIMIT)
         _log.info("Deep agent created successfully")
-        return graph
+        # Tag every run of this graph so Langfuse traces can be grouped by
+        # prompt prefix and correlated with cache_read token counts
+        return graph.with_config(metadata={"prompt_prefix_sha": prompt_sha})
 
     except Exception as exc:
         _log.error("Failed to build deep agent: %s", exc, exc_info=True)
         raise
 
 
+def _content_to_text(content: Any) -> str:
+    """Return the text of a message's content.
+
+    Handles both plain strings and Anthropic structured content (a list of
+    typed content blocks), flattening text blocks and skipping tool_use and
+    other non-text block types.
+    """
+    if isinstance(content, list):
+        return " ".join(
+            block.get("text", "") if isinstance(block, dict) else str(block)
+            for block in content
+            if not isinstance(block, dict) or block.get("type") == "text"
+        )
+    return content or ""
+
+
+def _build_run_config(thread_id: str) -> RunnableConfig:
+    """Build the per-invocation config for a conversation thread."""
+    # Callbacks passed at invoke time propagate to all child runnables
+    # (including the LLM), leaving the cached graph itself untouched.
+    _get_langfuse_handler()
+    return RunnableConfig(
+        configurable={"thread_id": thread_id},
+        tags=list(_RUN_TAGS),
+        recursion_limit=SETTINGS.recursion_limit,
+        callbacks=_langfuse_callbacks,
+    )
+
+
+def _log_cache_metrics(correlation_id: str, usage_metadata: Any) -> None:
+    """Log prompt-cache token accounting for one model response.
+
+    LangChain's ``input_tokens`` is the total prompt size and already includes
+    cached tokens; the cache split lives in ``input_token_details``.  Field
+    names mirror the PostHog ``$ai_cache_*_input_tokens`` properties.
+    """
+    details = usage_metadata.get("input_token_details") or {}
+    cache_creation = details.get("cache_creation") or 0
+    cache_read = details.get("cache_read") or 0
+    total_input = usage_metadata.get("input_tokens") or 0
+    _log.info(
+        "[CacheMetrics] correlation_id=%s cache_creation_input_tokens=%d cache_read_input_tokens=%d "
+        "raw_input_tokens=%d total_input_tokens=%d cache_hit_rate=%.3f",
+        correlation_id,
+        cache_creation,
+        cache_read,
+        max(0, total_input - cache_creation - cache_read),
+        total_input,
+        cache_read / max(1, total_input),
+    )
+
+
+def _turn_used_tools(messages: list) -> bool:
+    """Return ``True`` if any tool ran since the latest ``HumanMessage``."""
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            return False
+        if isinstance(message, ToolMessage):
+            return True
+    return False
+
+
+async def _latest_checkpoint_id(graph: Any, config: RunnableConfig) -> str | None:
+    """Return the id of the thread's latest checkpoint, or ``None`` for a new thread."""
+    checkpoint = await graph.checkpointer.aget_tuple(config)
+    return checkpoint.checkpoint["id"] if checkpoint else None
+
+
 async def process_message(
     user_input: str,
     thread_id: str,
@@ -288,18 +702,36 @@ async def process_message(
         username: Username associated with the request (used for logging/audit).
         user_token: Bearer token for MCP authentication.
         cancellation_check: Callable that returns ``True`` when the request
-            should be aborted before execution begins.
+            should be aborted; checked before the run and between graph steps.
 
     Returns:
         The agent's response as a plain string. Returns a user-friendly error
         message string on failure rather than raising, so callers can surface
         it directly to the user.
     """
-    correlation_id = generate_correlation_id()
-    request_start_time = time.perf_counter()
+    with bind_request_context(username) as correlation_id:
+        return await _process_message(
+            user_input,
+            thread_id,
+            correlation_id,
+            provider=provider,
+            username=username,
+            user_token=user_token,
+            cancellation_check=cancellation_check,
+        )
+
 
-    if username:
-        set_user(username)
+async def _process_message(
+    user_input: str,
+    thread_id: str,
+    correlation_id: str,
+    provider: str | None = None,
+    username: str | None = None,
+    user_token: str | None = None,
+    cancellation_check: Callable[[], bool] | None = None,
+) -> str:
+    """Run one request for :func:`process_message` inside its bound logging context."""
+    request_start_time = time.perf_counter()
 
     _log.info(
         "[RequestStart] correlation_id=%s thread=%s user=%s input_len=%d",
@@ -312,32 +744,59 @@ async def process_message(
     if cancellation_check and cancellation_check():
         return "Request was cancelled. Starting fresh conversation."
 
-    try:
-        graph = await build_deep_agent(provider=provider, user_token=user_token)
-
-        config = RunnableConfig(configurable={"thread_id": thread_id}, tags=["deep-agent", "mcp"])
-
-        result = await asyncio.wait_for(
-            graph.ainvoke({"messages": [HumanMessage(content=user_input)]}, config=config),
-            timeout=REQUEST_TIMEOUT_SECS,
+    if SETTINGS.fast_path_enabled and (match := _FAST_PATH_RE.match(user_input)):
+        _log.info(
+            "[RequestCompleted] correlation_id=%s fast_path=true duration_ms=%.1f",
+            correlation_id,
+            (time.perf_counter() - request_start_time) * 1000,
         )
+        return _FAST_PATH_GREETING if match["greeting"] else _FAST_PATH_THANKS
 
-        # Extract response text — handle both plain string and Anthropic structured
-        # content (list of typed content blocks).
-        last_message = result["messages"][-1]
-        raw_content = getattr(last_message, "content", None)
-        if isinstance(raw_content, list):
-            # Flatten text blocks; skip tool_use and other non-text block types.
-            response_text = (
-                " ".join(
-                    block.get("text", "") if isinstance(block, dict) else str(block)
-                    for block in raw_content
-                    if not isinstance(block, dict) or block.get("type") == "text"
-                )
-                or "No response generated"
+    try:
+        graph = await get_deep_agent(provider=provider, user_token=user_token)
+
+        config = _build_run_config(thread_id)
+
+        response_cache_key = None
+        if RESPONSE_CACHE_ENABLED:
+            # Keyed on the thread's latest checkpoint: an answer is stored under
+            # the checkpoint its run produced, so it is only replayed when the
+            # same prompt is repeated before the conversation moves on
+            llm_model = await get_default_model_cached()
+            response_cache_key = functools.partial(
+                build_response_cache_key,
+                user_input,
+                thread_id,
+                token_scope=_token_scope(user_token),
+                provider=provider,
+                model_pk=llm_model.pk,
             )
-        else:
-            response_text = raw_content or "No response generated"
+            checkpoint_id = await _latest_checkpoint_id(graph, config)
+            cached_response = await get_cached_response(response_cache_key(checkpoint_id=checkpoint_id))
+            if cached_response is not None:
+                _log.info(
+                    "[RequestCompleted] correlation_id=%s cache_hit=true duration_ms=%.1f",
+                    correlation_id,
+                    (time.perf_counter() - request_start_time) * 1000,
+                )
+                return cached_response
+
+        # user_input is already a str, so skip pydantic validation on the hot path
+        message = HumanMessage.model_construct(content=user_input)
+
+        # Stream state after each step (rather than ainvoke) so a cancelled
+        # request stops between steps instead of running to completion.
+        result: dict[str, Any] = {}
+        async with asyncio.timeout(SETTINGS.request_timeout_secs):
+            async with aclosing(graph.astream({"messages": [message]}, config=config, stream_mode="values")) as steps:
+                async for state in steps:
+                    result = state
+                    if cancellation_check and cancellation_check():
+                        _log.info("[RequestCancelled] correlation_id=%s", correlation_id)
+                        return "Request was cancelled. Starting fresh conversation."
+
+        last_message = result["messages"][-1]
+        response_text = _content_to_text(getattr(last_message, "content", None)) or "No response generated"
 
         duration_ms = (time.perf_counter() - request_start_time) * 1000
 
@@ -345,20 +804,19 @@ async def process_message(
         # Guard with hasattr to handle varying UsageMetadata implementations.
         usage_metadata = getattr(last_message, "usage_metadata", None)
         if usage_metadata and hasattr(usage_metadata, "get"):
-            _log.info(
-                "[CacheMetrics] correlation_id=%s cache_creation=%s cache_read=%s input_tokens=%s",
-                correlation_id,
-                usage_metadata.get("cache_creation_input_tokens", 0),
-                usage_metadata.get("cache_read_input_tokens", 0),
-                usage_metadata.get("input_tokens", 0),
-            )
+            _log_cache_metrics(correlation_id, usage_metadata)
+
+        # Only cache answers that didn't depend on live tool results
+        if response_cache_key and not _turn_used_tools(result["messages"]):
+            checkpoint_id = await _latest_checkpoint_id(graph, config)
+            await store_cached_response(response_cache_key(checkpoint_id=checkpoint_id), str(response_text))
 
         _log.info("[RequestCompleted] correlation_id=%s duration_ms=%.1f", correlation_id, duration_ms)
         return str(response_text)
 
-    except asyncio.TimeoutError:
+    except TimeoutError:
         _log.error("[timeout] correlation_id=%s", correlation_id)
-        return f"Request timed out after {REQUEST_TIMEOUT_SECS} seconds. Please try a simpler query."
+        return f"Request timed out after {SETTINGS.request_timeout_secs} seconds. Please try a simpler query."
 
     except RuntimeError as exc:
         # Handle asyncio event-loop errors that occur when cached async resources
@@ -370,12 +828,12 @@ async def process_message(
                 exc,
                 exc_info=True,
             )
-            from ai_ops.helpers.deep_agent.checkpoint_factory import _checkpointers
-            from ai_ops.helpers.deep_agent.store_factory import _stores
-
-            _checkpointers.clear()
-            _stores.clear()
-            _log.warning("[event_loop_error] Cleared cached checkpointers/stores — will recreate on next request")
+            clear_checkpointer_cache()
+            clear_store_cache()
+            clear_graph_cache()
+            _log.warning(
+                "[event_loop_error] Cleared cached graphs/checkpointers/stores — will recreate on next request"
+            )
 
             return (
                 "An internal error occurred (event loop issue). "
@@ -388,6 +846,107 @@ async def process_message(
         return f"Error processing message: {exc}"
 
 
+def stream_message(
+    user_input: str,
+    thread_id: str,
+    provider: str | None = None,
+    username: str | None = None,
+    user_token: str | None = None,
+    cancellation_check: Callable[[], bool] | None = None,
+) -> AsyncIterator[str]:
+    """Stream the deep agent's response text as it is generated.
+
+    Streaming counterpart of :func:`process_message` for callers that can
+    forward partial output (e.g. server-sent events).  Only tokens from the
+    top-level agent's model are yielded; subagent output is internal.
+
+    Args:
+        user_input: The user's input message.
+        thread_id: Conversation thread identifier (used for checkpointing).
+        provider: Optional LLM provider override.
+        username: Username associated with the request (used for logging/audit).
+        user_token: Bearer token for MCP authentication.
+        cancellation_check: Callable that returns ``True`` when the request
+            should be aborted; checked before the run and between events.
+
+    Returns:
+        An async iterator of response text chunks. Failures are reported as a
+        final user-friendly chunk rather than raised.
+    """
+    # Runs in a task of its own so the request context is never left bound in
+    # the caller's context between chunks
+    return stream_in_request_context(
+        username,
+        functools.partial(
+            _stream_message,
+            user_input,
+            thread_id,
+            provider=provider,
+            username=username,
+            user_token=user_token,
+            cancellation_check=cancellation_check,
+        ),
+    )
+
+
+async def _stream_message(
+    user_input: str,
+    thread_id: str,
+    correlation_id: str,
+    provider: str | None = None,
+    username: str | None = None,
+    user_token: str | None = None,
+    cancellation_check: Callable[[], bool] | None = None,
+) -> AsyncIterator[str]:
+    """Run one request for :func:`stream_message` inside its bound logging context."""
+    request_start_time = time.perf_counter()
+
+    _log.info(
+        "[StreamStart] correlation_id=%s thread=%s user=%s input_len=%d",
+        correlation_id,
+        thread_id,
+        username or "anonymous",
+        len(user_input),
+    )
+
+    if cancellation_check and cancellation_check():
+        yield "Request was cancelled. Starting fresh conversation."
+        return
+
+    try:
+        graph = await get_deep_agent(provider=provider, user_token=user_token)
+        config = _build_run_config(thread_id)
+        message = HumanMessage.model_construct(content=user_input)
+
+        async with asyncio.timeout(SETTINGS.request_timeout_secs):
+            async for event in graph.astream_events({"messages": [message]}, config=config, version="v2"):
+                if cancellation_check and cancellation_check():
+                    _log.info("[StreamCancelled] correlation_id=%s", correlation_id)
+                    return
+                if event["event"] != "on_chat_model_stream":
+                    continue
+                # Nested graphs (subagents) run under a "parent|child" checkpoint namespace
+                if "|" in event.get("metadata", {}).get("langgraph_checkpoint_ns", ""):
+                    continue
+                text = _content_to_text(event["data"]["chunk"].content)
+                if text:
+                    yield text
+
+        _log.info(
+            "[StreamCompleted] correlation_id=%s duration_ms=%.1f",
+            correlation_id,
+            (time.perf_counter() - request_start_time) * 1000,
+        )
+
+    except TimeoutError:
+        _log.error("[timeout] correlation_id=%s", correlation_id)
+        yield f"Request timed out after {SETTINGS.request_timeout_secs} seconds. Please try a simpler query."
+
+    except Exception as exc:
+        _log.error("[error] correlation_id=%s details=%s", correlation_id, exc, exc_info=True)
+        yield f"Error processing message: {exc}"
+
+
 async def warmup_deep_agent_connections() -> None:
     """Pre-warm the Redis checkpointer and store connections.
 
@@ -421,20 +980,45 @@ async def warmup_deep_agent_connections() -> None:
         _log.warning("[warmup] Store warmup failed (will retry on first request): %s", exc)
 
 
+async def warmup_deep_agent_caches() -> None:
+    """Pre-populate the loop-independent deep agent caches.
+
+    Unlike :func:`warmup_deep_agent_connections`, this is safe to run from the
+    startup warmup thread: it only touches state that outlives the event loop
+    it runs on — the module import itself (which parses the subagent YAML) and
+    the Langfuse handler (whose HTTP client is thread-based).  Checkpointer/store pools are
+    loop-bound and compiled graphs need them, so both are still created on the first request.
+
+    Errors are caught and logged — a failed warmup is never fatal.
+    """
+    _log.info("[warmup] Subagent configuration parsed (%d subagents)", len(_SUBAGENT_SPECS))
+
+    if SETTINGS.enable_langfuse:
+        _get_langfuse_handler()
+
+
 async def shutdown_deep_agent() -> None:
     """Gracefully shut down deep agent resources.
 
     Should be called during application shutdown to ensure proper cleanup of:
+    - Cached compiled graphs
     - Checkpointer connection pools
     - Redis / store connections
+    - The shared MCP connection pool
+    - Queued Langfuse events
     """
     _log.info("Shutting down deep agent resources...")
+    clear_graph_cache()
+    if _langfuse_handler is not None:
+        try:
+            # flush() blocks until the background worker drains its queue
+            await asyncio.to_thread(_langfuse_handler.flush)
+        except Exception as exc:
+            _log.warning("Langfuse flush failed during shutdown: %s", exc)
     try:
-        from ai_ops.helpers.deep_agent.checkpoint_factory import close_all_pools
-        from ai_ops.helpers.deep_agent.store_factory import close_all_stores
-
         await close_all_pools()
         await close_all_stores()
+        await close_mcp_transport()
         _log.info("Shutdown completed successfully")
 
     except Exception as exc:
@@ -5,25 +5,34 @@ enterprise features including caching, health checks, and checkpointing.
 """
 
 import asyncio
+import functools
 import logging
 import time
-from datetime import datetime
-from typing import Callable
+import weakref
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, AsyncIterator, Callable, NamedTuple
 
 import httpx
 from asgiref.sync import sync_to_async
-from langchain_core.messages import HumanMessage
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.runnables import RunnableConfig
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from nautobot.apps.config import get_app_settings_or_config
 
-from ai_ops.helpers.common.asyncio_utils import get_or_create_event_loop_lock
-from ai_ops.helpers.get_llm_model import get_llm_model_async
+from ai_ops.checkpointer import get_checkpointer
+from ai_ops.helpers.common.mcp_http import HTTP2_AVAILABLE, get_mcp_client_limits
+from ai_ops.helpers.get_llm_model import get_default_model_cached, get_llm_model_async
+from ai_ops.helpers.get_middleware import get_middleware
+from ai_ops.helpers.get_prompt import aget_cached_active_prompt
 from ai_ops.helpers.logging_config import (
-    generate_correlation_id,
-    get_correlation_id,
-    get_user,
-    set_user,
+    bind_request_context,
+    correlation_id_var,
+    stream_in_request_context,
+    user_var,
 )
+from ai_ops.helpers.mcp_tool_catalog import get_catalog_key, load_tool_catalog, purge_tool_catalog, save_tool_catalog
 from ai_ops.helpers.tool_callback import ToolLoggingCallback
 from ai_ops.models import MCPServer
 
@@ -33,204 +42,563 @@ logger = logging.getLogger(__name__)
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
-# Lazy lock initialization to avoid event loop binding issues
-# Use list to allow modification via get_or_create_event_loop_lock
-_cache_lock: list = [None]
+# One cache lock per event loop; asyncio locks can't be shared across loops
+_cache_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
 
 
-# Application-level cache structure
-_mcp_client_cache = {
-    "client": None,
-    "tools": None,
-    "timestamp": None,
-    "server_count": 0,
-}
+def _get_cache_lock() -> asyncio.Lock:
+    """Return the cache lock for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    lock = _cache_locks.get(loop)
+    if lock is None:
+        lock = _cache_locks[loop] = asyncio.Lock()
+    return lock
+
+
+class _CacheSnapshot(NamedTuple):
+    """Immutable view of the MCP client cache.
+
+    The module rebinds ``_cache_snapshot`` to a new instance on every update, so
+    readers get a consistent client/tools/timestamp set without taking the lock.
+    """
+
+    client: MultiServerMCPClient | None
+    tools: list | None
+    timestamp: float | None  # time.monotonic() at refresh
+    server_count: int
+    server_signature: frozenset | None = None
+    discovered_at: float | None = None  # time.monotonic() of the last tool discovery
+    complete: bool = False  # every server answered the last tool discovery
+
+
+_EMPTY_SNAPSHOT = _CacheSnapshot(client=None, tools=None, timestamp=None, server_count=0)
+
+# Application-level cache; writers hold the cache lock, readers don't need it
+_cache_snapshot: _CacheSnapshot = _EMPTY_SNAPSHOT
+
+# One pooled httpx client per event loop, shared by every MCP server and session
+_shared_httpx_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def _inject_trace_headers(request: httpx.Request) -> None:
+    """Add X-Correlation-ID and X-Nautobot-User headers for cross-service tracing.
+
+    Runs as an httpx request hook so the values are taken from the context of
+    the task issuing the request rather than the one that created the client.
+    """
+    # Read the ContextVars directly: this runs for every MCP HTTP request
+    correlation_id = correlation_id_var.get()
+    if correlation_id:
+        request.headers["X-Correlation-ID"] = correlation_id
+    user = user_var.get()
+    if user:
+        request.headers["X-Nautobot-User"] = user
+
+
+class _SharedClientHandle:
+    """Async context manager that yields the shared client without closing it.
+
+    The MCP transports open the factory result with ``async with`` and would
+    otherwise close the pooled client at the end of every session.
+    """
+
+    __slots__ = ("_client",)
+
+    def __init__(self, client: httpx.AsyncClient):
+        self._client = client
+
+    async def __aenter__(self) -> httpx.AsyncClient:
+        return self._client
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+
+def _get_shared_httpx_client() -> httpx.AsyncClient:
+    """Return the pooled httpx client for the running event loop, creating it on first use.
+
+    Note: verify=False is intentional per requirements for connecting
+    to internal MCP servers with self-signed certificates.
+    """
+    loop = asyncio.get_running_loop()
+    client = _shared_httpx_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            verify=False,  # noqa: S501 - intentional per requirements
+            limits=get_mcp_client_limits(),
+            http2=HTTP2_AVAILABLE,
+            # Matches the MCP streamable HTTP defaults (30s, 300s SSE read)
+            timeout=httpx.Timeout(30.0, read=300.0),
+            event_hooks={"request": [_inject_trace_headers]},
+        )
+        _shared_httpx_clients[loop] = client
+    return client
+
+
+def _httpx_client_factory(**kwargs) -> _SharedClientHandle:
+    """Factory handed to MultiServerMCPClient that reuses the shared httpx client.
+
+    The MCP library calls this once per session (every ``get_tools`` and tool
+    call), so returning the shared client keeps TCP/TLS connections alive
+    across tool calls instead of rebuilding the pool each time.
+    """
+    return _SharedClientHandle(_get_shared_httpx_client())
+
+
+async def _close_shared_httpx_client() -> None:
+    """Close the shared httpx client bound to the running event loop, if any."""
+    client = _shared_httpx_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+# Refresh currently rebuilding the cache; concurrent misses await it instead
+_refresh_in_flight: asyncio.Future | None = None
+
+# Refresh tasks, kept referenced until they finish so they aren't garbage collected
+_refresh_tasks: set[asyncio.Task] = set()
+
+# Periodic refresher started by warm_mcp_cache(keep_warm=True)
+_keep_warm_task: asyncio.Task | None = None
+
+# Per-server circuit breaker: after this many consecutive discovery failures a
+# server is left out of the client until the reset window lets a probe through
+_BREAKER_FAILURE_THRESHOLD = 3
+_BREAKER_RESET_SECS = 30.0
+
+# Refreshes keep the cached tools of an unchanged server set for at most this
+# long; servers can add or remove tools without their MCPServer row changing
+_TOOL_REDISCOVERY_SECS = 900.0
+
+
+@dataclass
+class _ServerBreaker:
+    """Consecutive failure count and open time for one MCP server."""
+
+    failures: int = 0
+    opened_at: float | None = None
+
+
+_server_breakers: dict[str, _ServerBreaker] = {}
+
+
+def _breaker_allows(server_name: str) -> bool:
+    """Return True unless the server's breaker is open and still inside its reset window."""
+    breaker = _server_breakers.get(server_name)
+    if breaker is None or breaker.opened_at is None:
+        return True
+    # Half-open: let a probe through once the reset window has passed
+    return time.monotonic() - breaker.opened_at >= _BREAKER_RESET_SECS
+
+
+def _record_discovery_result(server_name: str, ok: bool) -> None:
+    """Close the server's breaker on success; count the failure and open it at the threshold."""
+    if ok:
+        if _server_breakers.pop(server_name, None) is not None:
+            logger.info("[mcp_connect] circuit closed for server %s", server_name)
+        return
+    breaker = _server_breakers.setdefault(server_name, _ServerBreaker())
+    breaker.failures += 1
+    if breaker.failures >= _BREAKER_FAILURE_THRESHOLD:
+        if breaker.opened_at is None:
+            logger.warning(
+                "[mcp_connect] circuit opened for server %s after %s failures, retrying in %.0fs",
+                server_name,
+                breaker.failures,
+                _BREAKER_RESET_SECS,
+            )
+        breaker.opened_at = time.monotonic()
+
+
+# Request timeout / recursion limit from app settings, cached as (monotonic expiry, timeout, limit)
+_AGENT_SETTINGS_TTL = 60.0
+_agent_settings_cache: tuple[float, int, int] | None = None
+
+
+class _AgentCacheEntry(NamedTuple):
+    """Compiled agent graph together with the inputs it was built from."""
+
+    graph: Any
+    checkpointer: Any
+    tools: list
+    expires_at: float  # time.monotonic() deadline
+
+
+# Compiled agent graphs keyed by (LLMModel pk, provider override)
+_agent_cache: dict[tuple, _AgentCacheEntry] = {}
+# Bumped on invalidation so builds that started before it are not cached
+_agent_cache_generation = 0
 
 # Note: This module is used in both sync and async contexts.
 # All ORM and Nautobot model access is wrapped with sync_to_async.
 # Shutdown is handled via async_shutdown and atexit/signal handlers.
 
 
-async def get_or_create_mcp_client(force_refresh: bool = False) -> tuple[MultiServerMCPClient | None, list]:
-    """Get or create MCP client with application-level caching.
+async def _get_cache_ttl() -> int:
+    """Return the MCP cache TTL in seconds from the default LLM model (300s fallback).
 
-    Args:
-        force_refresh: Force cache refresh even if not expired
+    The default model comes from the shared in-process cache, so cache hits do
+    not cost a database round trip.
+    """
+    try:
+        default_model = await get_default_model_cached()
+        return default_model.cache_ttl
+    except Exception as e:
+        logger.warning("Failed to get cache TTL from default model, using 300s: %s", e)
+        return 300
+
+
+def _get_fresh_cache_entry(max_age_seconds: int) -> tuple[MultiServerMCPClient, list] | None:
+    """Return the cached (client, tools) pair if it is younger than ``max_age_seconds``."""
+    snapshot = _cache_snapshot
+    if snapshot.client is None:
+        return None
+    cache_age = time.monotonic() - snapshot.timestamp
+    if cache_age >= max_age_seconds:
+        return None
+    logger.debug("Using cached MCP client (age: %.1fs, max age: %ss)", cache_age, max_age_seconds)
+    return snapshot.client, snapshot.tools
+
+
+async def _discover_tools(client: MultiServerMCPClient, server_names: list[str]) -> dict[str, list]:
+    """Load tools from every server concurrently, skipping servers that fail.
+
+    ``client.get_tools()`` without a server name fails as a whole when any one
+    server errors, so each server is queried separately and failures are
+    logged instead of discarding the tools of the healthy ones.
 
     Returns:
-        Tuple of (client, tools) or (None, []) if no healthy servers
+        The tools of each server that answered, keyed by server name.
     """
-    # Get lock bound to current event loop
-    lock = get_or_create_event_loop_lock(_cache_lock, "mcp_cache_lock")
+    results = await asyncio.gather(
+        *(client.get_tools(server_name=name) for name in server_names),
+        return_exceptions=True,
+    )
+
+    tools_by_server = {}
+    for name, result in zip(server_names, results):
+        if isinstance(result, BaseException):
+            if not isinstance(result, Exception):
+                raise result
+            logger.warning("[mcp_connect] tool discovery failed for server %s: %s", name, result)
+            _record_discovery_result(name, ok=False)
+            continue
+        _record_discovery_result(name, ok=True)
+        tools_by_server[name] = result
+    return tools_by_server
+
+
+async def _refresh_mcp_client(rediscover: bool = False) -> tuple[MultiServerMCPClient | None, list]:
+    """Rebuild the MCP client from the healthy servers and store it in the cache.
+
+    When the server set is unchanged since the last refresh and every server
+    returned its tools then, the cached tools are kept and only the timestamp
+    is renewed, until ``_TOOL_REDISCOVERY_SECS`` have passed since the last
+    discovery; after a partial discovery the servers are queried again on
+    every refresh so a recovered server is picked up promptly.  Pass
+    ``rediscover=True`` to query the servers for their tools regardless.
+    On a cold cache the tools are rebuilt from the on-disk tool catalog when
+    one exists for the current server set; the next refresh then rediscovers.
+
+    Called by ``_run_refresh`` with the cache lock held.
+    """
+    global _cache_snapshot
+
+    now = time.monotonic()
 
+    # Query for enabled, healthy MCP servers
     try:
-        async with lock:
-            now = datetime.now()
+        servers = await sync_to_async(list)(
+            MCPServer.objects.filter(
+                status__name="Healthy",  # Single query with lookup
+                protocol="http",
+            ).select_related("status")
+        )
 
-            # Get cache TTL from default LLM model
-            try:
-                from ai_ops.models import LLMModel
+        # Leave out servers whose circuit breaker is open
+        available = [server for server in servers if _breaker_allows(server.name)]
+        if len(available) < len(servers):
+            logger.warning("[mcp_connect] skipping %s server(s) with an open circuit", len(servers) - len(available))
+        servers = available
 
-                default_model = await sync_to_async(LLMModel.get_default_model)()
-                cache_ttl_seconds = default_model.cache_ttl
-            except Exception as e:
-                logger.warning(f"Failed to get cache TTL from default model, using 300s: {e}")
-                cache_ttl_seconds = 300
+        if not servers:
+            logger.warning("No enabled, healthy MCP servers found")
+            _cache_snapshot = _CacheSnapshot(client=None, tools=[], timestamp=now, server_count=0)
+            return None, []
 
-            # Check cache validity
-            if not force_refresh and _mcp_client_cache["client"] is not None:
-                cache_age = (now - _mcp_client_cache["timestamp"]).total_seconds()
-                if cache_age < cache_ttl_seconds:
-                    logger.debug(f"Using cached MCP client (age: {cache_age:.1f}s, TTL: {cache_ttl_seconds}s)")
-                    return _mcp_client_cache["client"], _mcp_client_cache["tools"]
+        # Reuse the existing client when no server was added, removed, or edited
+        server_signature = frozenset(
+            (server.name, server.url, server.mcp_endpoint, server.last_updated) for server in servers
+        )
+        previous = _cache_snapshot
+        if previous.client is not None and previous.server_signature == server_signature:
+            tools_fresh = previous.discovered_at is not None and now - previous.discovered_at < _TOOL_REDISCOVERY_SECS
+            if previous.tools and previous.complete and tools_fresh and not rediscover:
+                logger.debug("[mcp_connect] server set unchanged, keeping %d cached tools", len(previous.tools))
+                _cache_snapshot = previous._replace(timestamp=now)
+                return previous.client, previous.tools
+            client = previous.client
+        else:
+            connections = {
+                server.name: {
+                    "transport": "streamable_http",
+                    "url": server.full_mcp_url,
+                    "httpx_client_factory": _httpx_client_factory,
+                }
+                for server in servers
+            }
 
-            # Query for enabled, healthy MCP servers
-            try:
-                from nautobot.extras.models import Status
-
-                healthy_status = await sync_to_async(Status.objects.get)(name="Healthy")
-                servers = await sync_to_async(list)(
-                    MCPServer.objects.filter(
-                        status__name="Healthy",
-                        protocol="http",
-                        status=healthy_status,
+            # Create MultiServerMCPClient
+            client = MultiServerMCPClient(connections)
+
+            # Cold cache: skip discovery when a catalog for this exact server set is on disk
+            if previous.client is None and not rediscover:
+                tools = await asyncio.to_thread(load_tool_catalog, get_catalog_key(servers), connections)
+                if tools is not None:
+                    logger.info("[mcp_connect] loaded %d tools from the tool catalog", len(tools))
+                    # No discovered_at: the next refresh verifies the catalog against the servers
+                    _cache_snapshot = _CacheSnapshot(
+                        client=client,
+                        tools=tools,
+                        timestamp=now,
+                        server_count=len(servers),
+                        server_signature=server_signature,
+                        complete=True,
                     )
-                )
+                    return client, tools
+
+        tools_by_server = await _discover_tools(client, [server.name for server in servers])
+        tools = [tool for server_tools in tools_by_server.values() for tool in server_tools]
+
+        # Stage: mcp_connect - Log tool discovery
+        logger.info("[mcp_connect] discovered %d tools from %d server(s)", len(tools), len(servers))
+
+        # Only a complete discovery is persisted or reused, so a failed server is retried
+        complete = len(tools_by_server) == len(servers)
+        if complete:
+            await asyncio.to_thread(save_tool_catalog, get_catalog_key(servers), tools_by_server)
+
+        # Update cache
+        _cache_snapshot = _CacheSnapshot(
+            client=client,
+            tools=tools,
+            timestamp=now,
+            server_count=len(servers),
+            server_signature=server_signature,
+            discovered_at=now,
+            complete=complete,
+        )
 
-                if not servers:
-                    logger.warning("No enabled, healthy MCP servers found")
-                    _mcp_client_cache.update(
-                        {
-                            "client": None,
-                            "tools": [],
-                            "timestamp": now,
-                            "server_count": 0,
-                        }
-                    )
-                    return None, []
-
-                # Build connections dict for MultiServerMCPClient
-                def httpx_client_factory(**kwargs):
-                    """Factory for httpx client with SSL verification disabled.
-
-                    Note: verify=False is intentional per requirements for connecting
-                    to internal MCP servers with self-signed certificates.
-                    Includes X-Correlation-ID and X-Nautobot-User headers for cross-service tracing.
-                    """
-                    # Get correlation ID and user from current context for cross-service tracing
-                    correlation_id = get_correlation_id()
-                    user = get_user()
-                    headers = {}
-                    if correlation_id:
-                        headers["X-Correlation-ID"] = correlation_id
-                    if user:
-                        headers["X-Nautobot-User"] = user
-
-                    return httpx.AsyncClient(
-                        verify=False,  # noqa: S501 - intentional per requirements
-                        headers=headers,
-                        limits=httpx.Limits(
-                            max_keepalive_connections=5,
-                            max_connections=10,
-                        ),
-                    )
+        logger.info("[mcp_connect] cache updated: servers=%s, tools=%s", len(servers), len(tools))
+        return client, tools
 
-                connections = {}
-                for server in servers:
-                    # Build full MCP URL: base_url + mcp_endpoint
-                    mcp_url = f"{server.url.rstrip('/')}{server.mcp_endpoint}"
-                    connections[server.name] = {
-                        "transport": "streamable_http",
-                        "url": mcp_url,
-                        "httpx_client_factory": httpx_client_factory,
-                    }
-
-                # Create MultiServerMCPClient
-                client = MultiServerMCPClient(connections)
-                tools = await client.get_tools()
-
-                # Stage: mcp_connect - Log tool discovery
-                logger.warning(f"[mcp_connect] discovered {len(tools)} tools from {len(servers)} server(s)")
-
-                # Update cache
-                _mcp_client_cache.update(
-                    {
-                        "client": client,
-                        "tools": tools,
-                        "timestamp": now,
-                        "server_count": len(servers),
-                    }
-                )
+    except Exception as e:
+        logger.error("Failed to create MCP client: %s", e, exc_info=True)
+        _cache_snapshot = _CacheSnapshot(client=None, tools=[], timestamp=now, server_count=0)
+        return None, []
 
-                logger.info(f"[mcp_connect] cache updated: servers={len(servers)}, tools={len(tools)}")
-                return client, tools
 
-            except Exception as e:
-                logger.error(f"Failed to create MCP client: {e}", exc_info=True)
-                _mcp_client_cache.update(
-                    {
-                        "client": None,
-                        "tools": [],
-                        "timestamp": now,
-                        "server_count": 0,
-                    }
-                )
-                return None, []
+async def _run_refresh(future: asyncio.Future, rediscover: bool) -> None:
+    """Rebuild the MCP client under the cache lock and resolve ``future`` with the result."""
+    global _refresh_in_flight
+
+    lock = _get_cache_lock()
+    try:
+        async with lock:
+            result = await _refresh_mcp_client(rediscover=rediscover)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark retrieved so a background refresh nobody awaited isn't logged at GC
+        future.exception()
+    else:
+        future.set_result(result)
+    finally:
+        if _refresh_in_flight is future:
+            _refresh_in_flight = None
+
+
+def _start_refresh(rediscover: bool = False) -> asyncio.Future:
+    """Start a cache refresh on the running loop and publish it as the in-flight refresh."""
+    global _refresh_in_flight
+
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    _refresh_in_flight = future
+    task = loop.create_task(_run_refresh(future, rediscover))
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+    return future
+
+
+def _get_refresh_in_flight() -> asyncio.Future | None:
+    """Return the pending refresh for the running loop, if there is one."""
+    in_flight = _refresh_in_flight
+    if in_flight is None or in_flight.done() or in_flight.get_loop() is not asyncio.get_running_loop():
+        return None
+    return in_flight
+
+
+async def get_or_create_mcp_client(force_refresh: bool = False) -> tuple[MultiServerMCPClient | None, list]:
+    """Get or create MCP client with application-level caching.
+
+    Entries are fresh for the default model's ``cache_ttl``. Between one and
+    two TTLs the stale entry is returned immediately while a background task
+    refreshes it (stale-while-revalidate); only past two TTLs, or on a forced
+    refresh, do callers wait. Concurrent misses on the same event loop share
+    a single refresh.
+
+    Args:
+        force_refresh: Force cache refresh even if not expired, re-querying every
+            server for its tools even when the server set is unchanged
+
+    Returns:
+        Tuple of (client, tools) or (None, []) if no healthy servers
+    """
+    cache_ttl_seconds = await _get_cache_ttl()
+
+    try:
+        if not force_refresh:
+            # Fast path: serve a fresh cache entry without touching the lock
+            cached = _get_fresh_cache_entry(cache_ttl_seconds)
+            if cached is not None:
+                return cached
+
+            in_flight = _get_refresh_in_flight()
+
+            # Past the soft TTL but within the hard TTL: serve stale, refresh in the background
+            stale = _get_fresh_cache_entry(2 * cache_ttl_seconds)
+            if stale is not None:
+                if in_flight is None:
+                    logger.debug("Serving stale MCP client while refreshing in the background")
+                    _start_refresh()
+                return stale
+
+            # Join a refresh already running on this loop instead of starting another
+            if in_flight is not None:
+                return await asyncio.shield(in_flight)
+
+        return await asyncio.shield(_start_refresh(rediscover=force_refresh))
 
     except RuntimeError as e:
         if "cannot schedule new futures after interpreter shutdown" in str(e):
-            logger.warning(f"Cannot access MCP client during interpreter shutdown: {e}")
+            logger.warning("Cannot access MCP client during interpreter shutdown: %s", e)
             return None, []
         else:
             raise
     except Exception as e:
-        logger.error(f"Unexpected error in get_or_create_mcp_client: {e}", exc_info=True)
+        logger.error("Unexpected error in get_or_create_mcp_client: %s", e, exc_info=True)
         return None, []
 
 
-async def clear_mcp_cache() -> int:
+async def clear_mcp_cache(purge_catalog: bool = False) -> int:
     """Clear the MCP client cache.
 
+    Args:
+        purge_catalog: Also delete the on-disk tool catalog so the next refresh
+            queries every server for its tools. Left in place by default so
+            shutdown cleanup does not undo the catalog a restart relies on.
+
     Returns:
         Number of servers that were cached (for audit logging)
     """
+    global _cache_snapshot
+
     # Get lock bound to current event loop
-    lock = get_or_create_event_loop_lock(_cache_lock, "mcp_cache_lock")
+    lock = _get_cache_lock()
 
     async with lock:
-        cleared_count = _mcp_client_cache.get("server_count", 0)
+        cleared_count = _cache_snapshot.server_count
 
         # Close existing client if present
-        if _mcp_client_cache["client"] is not None:
+        if _cache_snapshot.client is not None:
             try:
                 # MultiServerMCPClient cleanup if needed
                 pass
             except Exception as e:
-                logger.warning(f"Error closing MCP client: {e}")
-
-        # Reset cache
-        _mcp_client_cache.update(
-            {
-                "client": None,
-                "tools": None,
-                "timestamp": None,
-                "server_count": 0,
-            }
-        )
+                logger.warning("Error closing MCP client: %s", e)
+
+        # Reset cache; compiled graphs hold the old client's tools, so drop them too
+        _cache_snapshot = _EMPTY_SNAPSHOT
+        clear_agent_cache()
+        if purge_catalog:
+            await asyncio.to_thread(purge_tool_catalog)
 
-        logger.info(f"Cleared MCP client cache (was tracking {cleared_count} server(s))")
+        logger.info("Cleared MCP client cache (was tracking %s server(s))", cleared_count)
         return cleared_count
 
 
-async def warm_mcp_cache():
-    """Warm the MCP client cache on application startup."""
+async def _keep_cache_warm() -> None:
+    """Refresh the MCP cache before each TTL elapses, for as long as the loop runs."""
+    while True:
+        cache_ttl_seconds = await _get_cache_ttl()
+        await asyncio.sleep(max(10, cache_ttl_seconds * 0.8))
+        try:
+            await get_or_create_mcp_client(force_refresh=True)
+        except Exception as e:
+            logger.warning("Background MCP cache refresh failed: %s", e)
+
+
+def _log_open_circuits() -> None:
+    """Warn about MCP servers whose circuit breaker is open after a warmup."""
+    open_circuits = [name for name, breaker in _server_breakers.items() if breaker.opened_at is not None]
+    if open_circuits:
+        logger.warning("MCP servers with an open circuit after warmup: %s", ", ".join(sorted(open_circuits)))
+
+
+def _on_background_warm_done(future: asyncio.Future) -> None:
+    """Report the outcome of a warmup started with ``background=True``."""
+    if future.cancelled():
+        return
+    if future.exception() is not None:
+        logger.warning("Failed to warm MCP cache on startup: %s", future.exception())
+    else:
+        _log_open_circuits()
+
+
+async def warm_mcp_cache(keep_warm: bool = False, background: bool = False):
+    """Warm the MCP client cache on application startup.
+
+    Args:
+        keep_warm: Also start a background task on the running loop that
+            refreshes the cache at 80% of its TTL, so requests never wait on a
+            refresh. Only useful when the loop outlives the call (e.g. an ASGI
+            lifespan handler); tasks on a loop that closes after warmup are
+            discarded with it. The task is cancelled by ``shutdown_mcp_client``.
+        background: Start the refresh and return without waiting for the MCP
+            servers to answer. Requests that arrive first join the in-flight
+            refresh. Same loop-lifetime caveat as ``keep_warm``.
+    """
+    global _keep_warm_task
+
     try:
         logger.info("Warming MCP client cache...")
-        await get_or_create_mcp_client(force_refresh=True)
+        if background:
+            # Publishing the refresh as in-flight lets early requests join it
+            if _get_refresh_in_flight() is None:
+                _start_refresh().add_done_callback(_on_background_warm_done)
+        else:
+            # Not forced, so a cold cache can be filled from the on-disk tool catalog
+            await get_or_create_mcp_client()
+            _log_open_circuits()
     except Exception as e:
-        logger.warning(f"Failed to warm MCP cache on startup: {e}")
+        logger.warning("Failed to warm MCP cache on startup: %s", e)
         # Don't raise - wait for scheduled health check
 
+    if keep_warm:
+        loop = asyncio.get_running_loop()
+        task = _keep_warm_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            _keep_warm_task = loop.create_task(_keep_cache_warm())
+            # Tracked with the refresh tasks so shutdown cancels it too
+            _refresh_tasks.add(_keep_warm_task)
+            _keep_warm_task.add_done_callback(_refresh_tasks.discard)
+            logger.info("Started background MCP cache refresher")
+
 
 async def shutdown_mcp_client():
     """Gracefully shutdown MCP client and clear cache.
@@ -238,54 +606,82 @@ async def shutdown_mcp_client():
     This function should be called during application shutdown to ensure
     proper cleanup of async resources and prevent shutdown errors.
     """
-    global _mcp_client_cache
+    global _cache_snapshot
 
-    lock = get_or_create_event_loop_lock(_cache_lock, "mcp_cache_lock")
+    lock = _get_cache_lock()
 
     try:
+        # Stop background refreshes so they don't repopulate the cache after shutdown
+        loop = asyncio.get_running_loop()
+        for task in list(_refresh_tasks):
+            if task.get_loop() is loop:
+                task.cancel()
+
         async with lock:
             logger.info("Shutting down MCP client...")
 
             # Close existing client if present
-            if _mcp_client_cache["client"] is not None:
+            if _cache_snapshot.client is not None:
                 try:
                     # Attempt to close client connections gracefully
-                    client = _mcp_client_cache["client"]
+                    client = _cache_snapshot.client
                     if hasattr(client, "close"):
                         await client.close()
                     elif hasattr(client, "aclose"):
                         await client.aclose()
                 except Exception as e:
-                    logger.warning(f"Error closing MCP client during shutdown: {e}")
+                    logger.warning("Error closing MCP client during shutdown: %s", e)
+
+            try:
+                await _close_shared_httpx_client()
+            except Exception as e:
+                logger.warning("Error closing shared MCP HTTP client during shutdown: %s", e)
 
             # Reset cache
-            _mcp_client_cache.update(
-                {
-                    "client": None,
-                    "tools": None,
-                    "timestamp": None,
-                    "server_count": 0,
-                }
-            )
+            _cache_snapshot = _EMPTY_SNAPSHOT
+            clear_agent_cache()
 
             logger.info("MCP client shutdown completed")
 
     except RuntimeError as e:
         if "cannot schedule new futures after interpreter shutdown" in str(e):
-            logger.warning(f"Cannot shutdown MCP client gracefully, interpreter already shutting down: {e}")
+            logger.warning("Cannot shutdown MCP client gracefully, interpreter already shutting down: %s", e)
             # Force clear the cache without async operations
-            _mcp_client_cache.update(
-                {
-                    "client": None,
-                    "tools": None,
-                    "timestamp": None,
-                    "server_count": 0,
-                }
-            )
+            _cache_snapshot = _EMPTY_SNAPSHOT
         else:
-            logger.error(f"Runtime error during MCP client shutdown: {e}", exc_info=True)
+            logger.error("Runtime error during MCP client shutdown: %s", e, exc_info=True)
     except Exception as e:
-        logger.error(f"Error during MCP client shutdown: {e}", exc_info=True)
+        logger.error("Error during MCP client shutdown: %s", e, exc_info=True)
+
+
+def _read_agent_settings() -> tuple[int, int]:
+    """Read the request timeout and recursion limit from app settings / Constance."""
+    return (
+        get_app_settings_or_config("ai_ops", "agent_request_timeout_seconds") or 120,
+        get_app_settings_or_config("ai_ops", "agent_recursion_limit") or 25,
+    )
+
+
+async def _get_agent_settings() -> tuple[int, int]:
+    """Return ``(request_timeout, recursion_limit)``, re-read at most every ``_AGENT_SETTINGS_TTL`` seconds.
+
+    Both values are fetched in one thread-pool hop and then served from memory,
+    so Constance edits take effect within the TTL without a lookup per request.
+    """
+    global _agent_settings_cache
+
+    cached = _agent_settings_cache
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1], cached[2]
+
+    try:
+        request_timeout, recursion_limit = await sync_to_async(_read_agent_settings)()
+    except Exception as e:
+        logger.warning("Failed to read agent settings, using defaults: %s", e)
+        request_timeout, recursion_limit = 120, 25
+
+    _agent_settings_cache = (time.monotonic() + _AGENT_SETTINGS_TTL, request_timeout, recursion_limit)
+    return request_timeout, recursion_limit
 
 
 async def build_agent(llm_model=None, checkpointer=None, provider: str | None = None):
@@ -305,15 +701,9 @@ async def build_agent(llm_model=None, checkpointer=None, provider: str | None =
     """
     logger.debug("Building agent with middleware and tools")
 
-    from langchain.agents import create_agent
-
-    from ai_ops.helpers.get_middleware import get_middleware
-    from ai_ops.helpers.get_prompt import get_active_prompt
-    from ai_ops.models import LLMModel
-
     # Get LLM model
     if llm_model is None:
-        llm_model = await sync_to_async(LLMModel.get_default_model)()
+        llm_model = await get_default_model_cached()
 
     # Get MCP client and tools
     client, tools = await get_or_create_mcp_client()
@@ -326,12 +716,13 @@ async def build_agent(llm_model=None, checkpointer=None, provider: str | None =
     # Middleware are always instantiated fresh to prevent state leaks between conversations
     middleware = await get_middleware(llm_model)
 
-    logger.info(f"Creating agent for {llm_model.name}: {len(tools)} tools, {len(middleware)} middleware")
+    logger.info("Creating agent for %s: %s tools, %s middleware", llm_model.name, len(tools), len(middleware))
 
     # Get system prompt from database or fallback to code-based prompt
     # Uses the SystemPrompt model with status='Approved' if available
-    # Inject tool info into the prompt for LLM grounding
-    system_prompt = await sync_to_async(get_active_prompt)(llm_model, tools=tools)
+    # Inject tool info into the prompt for LLM grounding; the rendered prompt is
+    # cached per (model, tool catalog) and cleared by the prompt/MCP server signals
+    system_prompt = await aget_cached_active_prompt(llm_model, tools=tools)
 
     # Create agent with middleware
     # If no tools are available, the agent will still work for basic conversation
@@ -347,6 +738,94 @@ async def build_agent(llm_model=None, checkpointer=None, provider: str | None =
     return graph
 
 
+def clear_agent_cache() -> None:
+    """Drop compiled agent graphs so the next request rebuilds them."""
+    global _agent_cache_generation
+
+    _agent_cache_generation += 1
+    _agent_cache.clear()
+
+
+async def get_agent(checkpointer=None, provider: str | None = None):
+    """Return a compiled agent for the default model, reusing a cached graph when possible.
+
+    A cached graph is reused until the model's ``cache_ttl`` elapses, as long as
+    it was built with the same checkpointer and the same cached MCP tools list;
+    a tool refresh or checkpointer reset therefore rebuilds it. Model, prompt
+    and middleware edits drop the cache through ``clear_agent_cache``, as do
+    ``clear_mcp_cache`` and ``shutdown_mcp_client``.
+
+    Args:
+        checkpointer: Checkpointer instance for conversation persistence.
+        provider: Optional provider name override.
+
+    Returns:
+        Compiled graph ready for execution
+    """
+    llm_model = await get_default_model_cached()
+    _, tools = await get_or_create_mcp_client()
+
+    key = (llm_model.pk, provider)
+    entry = _agent_cache.get(key)
+    if (
+        entry is not None
+        and entry.checkpointer is checkpointer
+        and entry.tools is tools
+        and entry.expires_at > time.monotonic()
+    ):
+        logger.debug("Using cached agent graph for %s", llm_model.name)
+        return entry.graph
+
+    generation = _agent_cache_generation
+    graph = await build_agent(llm_model=llm_model, checkpointer=checkpointer, provider=provider)
+    if generation == _agent_cache_generation:
+        _agent_cache[key] = _AgentCacheEntry(
+            graph=graph,
+            checkpointer=checkpointer,
+            tools=tools,
+            expires_at=time.monotonic() + llm_model.cache_ttl,
+        )
+    return graph
+
+
+_tool_call_name = attrgetter("name")
+
+
+def _extract_turn_response(messages: list) -> tuple[Any, list[str]]:
+    """Return the final response content and the tools called in the latest turn.
+
+    Walks the messages once, from the end back to the latest ``HumanMessage``.
+    The response is the newest AI message with content and no tool calls, so
+    an intermediate "calling a tool" message is never returned as the answer.
+    Tool names are collected newest first. Only AI messages carry tool calls,
+    so tool results and system messages are skipped without attribute lookups.
+    """
+    response_content = None
+    tools_called = []
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            break
+        if not isinstance(message, AIMessage):
+            continue
+        tool_calls = message.tool_calls
+        if tool_calls:
+            # LangChain tool calls are plain ToolCall dicts; attribute access is the fallback
+            tools_called.extend(tc["name"] if type(tc) is dict else _tool_call_name(tc) for tc in tool_calls)
+        elif response_content is None and message.content:
+            response_content = message.content
+    return response_content, tools_called
+
+
+def _build_run_config(thread_id: str, recursion_limit: int) -> RunnableConfig:
+    """Build the per-invocation config for a conversation thread."""
+    return RunnableConfig(
+        configurable={"thread_id": thread_id},
+        callbacks=[ToolLoggingCallback()],
+        tags=["mcp-agent"],
+        recursion_limit=recursion_limit,
+    )
+
+
 async def process_message(
     user_input: str,
     thread_id: str,
@@ -370,44 +849,147 @@ async def process_message(
     Raises:
         Exception: Logs and returns an error message if message processing fails.
     """
-    correlation_id = generate_correlation_id()
-    request_start_time = time.perf_counter()
+    with bind_request_context(username) as correlation_id:
+        request_start_time = time.perf_counter()
+
+        logger.info(
+            "[RequestStart] correlation_id=%s thread=%s user=%s input_len=%d",
+            correlation_id,
+            thread_id,
+            username or "anonymous",
+            len(user_input),
+        )
+
+        if cancellation_check and cancellation_check():
+            return "Request was cancelled. Starting fresh conversation."
+
+        try:
+            request_timeout, recursion_limit = await _get_agent_settings()
+
+            async with get_checkpointer() as checkpointer:
+                graph = await get_agent(checkpointer=checkpointer, provider=provider)
+
+                config = _build_run_config(thread_id, recursion_limit)
+
+                async with asyncio.timeout(request_timeout):
+                    result = await graph.ainvoke({"messages": [HumanMessage(content=user_input)]}, config=config)
+
+                response_text, tools_called = _extract_turn_response(result["messages"])
+
+                logger.info(
+                    "[RequestCompleted] correlation_id=%s tool_calls=%d duration_ms=%.1f",
+                    correlation_id,
+                    len(tools_called),
+                    (time.perf_counter() - request_start_time) * 1000,
+                )
+                if tools_called and logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("[RequestTools] correlation_id=%s tools=%s", correlation_id, ", ".join(tools_called))
+                return str(response_text or "No response generated")
+
+        except Exception as e:
+            logger.error("[error] correlation_id=%s details=%s", correlation_id, e, exc_info=True)
+            return f"Error processing message: {str(e)}"
+
+
+def stream_message(
+    user_input: str,
+    thread_id: str,
+    provider: str | None = None,
+    username: str | None = None,
+    cancellation_check: Callable[[], bool] | None = None,
+) -> AsyncIterator[str]:
+    """Stream the agent's response text as the model generates it.
+
+    Streaming counterpart of :func:`process_message` for callers that can
+    forward partial output, so the first tokens reach the user before the
+    run completes. :func:`process_message` remains the string-returning API.
+
+    Args:
+        user_input: The user's input message.
+        thread_id: Identifier for the conversation thread.
+        provider: Optional LLM provider override.
+        username: Username associated with the request.
+        cancellation_check: Callable that returns True if the request should
+            be cancelled; checked before the run and between events.
 
-    if username:
-        set_user(username)
+    Returns:
+        An async iterator of response text chunks. Failures are reported as a
+        final chunk rather than raised.
+    """
+    # Runs in a task of its own so the request context is never left bound in
+    # the caller's context between chunks
+    return stream_in_request_context(
+        username,
+        functools.partial(
+            _stream_message,
+            user_input,
+            thread_id,
+            provider=provider,
+            username=username,
+            cancellation_check=cancellation_check,
+        ),
+    )
+
+
+async def _stream_message(
+    user_input: str,
+    thread_id: str,
+    correlation_id: str,
+    provider: str | None = None,
+    username: str | None = None,
+    cancellation_check: Callable[[], bool] | None = None,
+) -> AsyncIterator[str]:
+    """Run one request for :func:`stream_message` inside its bound logging context."""
+    request_start_time = time.perf_counter()
 
     logger.info(
-        f"[RequestStart] correlation_id={correlation_id} thread={thread_id} user={username or 'anonymous'} input_len={len(user_input)}"
+        "[StreamStart] correlation_id=%s thread=%s user=%s input_len=%d",
+        correlation_id,
+        thread_id,
+        username or "anonymous",
+        len(user_input),
     )
 
     if cancellation_check and cancellation_check():
-        return "Request was cancelled. Starting fresh conversation."
+        yield "Request was cancelled. Starting fresh conversation."
+        return
 
     try:
-        from ai_ops.checkpointer import get_checkpointer
+        request_timeout, recursion_limit = await _get_agent_settings()
 
         async with get_checkpointer() as checkpointer:
-            graph = await build_agent(checkpointer=checkpointer, provider=provider)
-
-            config = RunnableConfig(
-                configurable={"thread_id": thread_id}, callbacks=[ToolLoggingCallback()], tags=["mcp-agent"]
-            )
-
-            result = await asyncio.wait_for(
-                graph.ainvoke({"messages": [HumanMessage(content=user_input)]}, config=config), timeout=120
-            )
-
-            last_message = result["messages"][-1]
-            response_text = getattr(last_message, "content", None) or "No response generated"
-
-            logger.info(
-                f"[RequestCompleted] correlation_id={correlation_id} duration_ms={(time.perf_counter() - request_start_time) * 1000:.1f}"
-            )
-            return str(response_text)
+            graph = await get_agent(checkpointer=checkpointer, provider=provider)
+            config = _build_run_config(thread_id, recursion_limit)
+
+            async with asyncio.timeout(request_timeout):
+                async for event in graph.astream_events(
+                    {"messages": [HumanMessage(content=user_input)]}, config=config, version="v2"
+                ):
+                    if cancellation_check and cancellation_check():
+                        logger.info("[StreamCancelled] correlation_id=%s", correlation_id)
+                        return
+                    if event["event"] != "on_chat_model_stream":
+                        continue
+                    content = event["data"]["chunk"].content
+                    # Anthropic models stream a list of typed content blocks
+                    if isinstance(content, list):
+                        content = "".join(
+                            block.get("text", "")
+                            for block in content
+                            if isinstance(block, dict) and block.get("type") == "text"
+                        )
+                    if content:
+                        yield content
+
+        logger.info(
+            "[StreamCompleted] correlation_id=%s duration_ms=%.1f",
+            correlation_id,
+            (time.perf_counter() - request_start_time) * 1000,
+        )
 
     except Exception as e:
-        logger.error(f"[error] correlation_id={correlation_id} details={e}", exc_info=True)
-        return f"Error processing message: {str(e)}"
+        logger.error("[error] correlation_id=%s details=%s", correlation_id, e, exc_info=True)
+        yield f"Error processing message: {str(e)}"
 
 
 # TODO: Implement long-term memory (Store) integration
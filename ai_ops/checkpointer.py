@@ -9,8 +9,8 @@ For persistent storage in production, use langgraph-checkpoint-postgres.
 
 import logging
 import os
+import time
 from contextlib import asynccontextmanager
-from datetime import datetime, timedelta
 
 import redis
 
@@ -22,7 +22,7 @@ logger = logging.getLogger(__name__)
 _memory_saver_instance = None
 # Use list to allow modification via get_or_create_event_loop_lock
 _memory_saver_lock: list = [None]
-# Global dict to track checkpoint creation timestamps for TTL enforcement
+# Global dict to track checkpoint creation times (time.monotonic()) for TTL enforcement
 _checkpoint_timestamps = {}
 
 # Note: This module is used in both sync and async contexts.
@@ -148,71 +148,49 @@ async def clear_checkpointer_for_thread(thread_id: str) -> bool:
 
     logger.debug(f"Clearing conversation history for thread: {thread_id}")
 
+    # Cached deep agent answers belong to the conversation being cleared
+    from ai_ops.helpers.deep_agent.response_cache import RESPONSE_CACHE_ENABLED, evict_thread_responses
+
+    if RESPONSE_CACHE_ENABLED:
+        try:
+            await evict_thread_responses(thread_id)
+        except Exception as e:
+            logger.warning(f"Failed to evict cached responses for thread {thread_id}: {e}")
+
     if _memory_saver_instance is None:
         logger.warning("No MemorySaver instance exists to clear")
         return False
 
     try:
-        # MemorySaver stores checkpoints in a dictionary keyed by tuples like (thread_id,)
-        # We can access the storage directly to clear a specific thread
-        config = {"configurable": {"thread_id": thread_id}}
-
-        # Get current state to check if thread exists
-        # Type ignore: LangGraph accepts dict config but types show RunnableConfig
-        try:
-            state = await _memory_saver_instance.aget(config)  # type: ignore[arg-type]
-        except KeyError:
-            # Thread doesn't exist in storage - this is expected for new/cleared threads
-            logger.debug(f"Thread {thread_id} not found in storage (KeyError)")
-            state = None
-
-        if state is None:
-            logger.debug(f"No conversation history found for thread {thread_id}")
-            return False
-
-        # Clear by removing from storage
-        # MemorySaver stores data with tuple keys like (thread_id,)
+        # Clear by removing from storage directly; the matching keys double as the
+        # existence check, so no extra aget() round trip is needed
         if hasattr(_memory_saver_instance, "storage"):
-            all_keys = list(_memory_saver_instance.storage.keys())
+            storage = _memory_saver_instance.storage
 
             # Create the thread key tuple - MemorySaver uses tuples for storage keys
             thread_key = (thread_id,)
 
-            # Clear all keys associated with this thread
             # MemorySaver may store keys as plain strings OR tuples like (thread_id, checkpoint_id, ...)
-            keys_to_delete = []
-            for key in all_keys:
-                # Check if key matches thread_id (handles both string keys and tuple keys)
-                if isinstance(key, str) and key == thread_id:
-                    keys_to_delete.append(key)
-                elif isinstance(key, tuple) and len(key) > 0 and key[0] == thread_id:
-                    keys_to_delete.append(key)
+            keys_to_delete = [
+                key
+                for key in storage
+                if (isinstance(key, str) and key == thread_id)
+                or (isinstance(key, tuple) and len(key) > 0 and key[0] == thread_id)
+            ]
 
             # Delete all matching keys
             for key in keys_to_delete:
-                del _memory_saver_instance.storage[key]
+                del storage[key]
 
             # Also remove timestamp tracking
-            if thread_key in _checkpoint_timestamps:
-                del _checkpoint_timestamps[thread_key]
+            _checkpoint_timestamps.pop(thread_key, None)
 
             if keys_to_delete:
                 logger.info(f"Cleared {len(keys_to_delete)} checkpoint(s) for thread {thread_id}")
-
-                # Verify state is actually cleared
-                try:
-                    verify_config = {"configurable": {"thread_id": thread_id}}
-                    verify_state = await _memory_saver_instance.aget(verify_config)  # type: ignore[arg-type]
-                    if verify_state is not None:
-                        logger.warning(f"Verification failed: state still exists for thread {thread_id}")
-                except KeyError:
-                    # After clearing, it's expected that the thread may not be found
-                    logger.debug(f"Verification passed: thread {thread_id} not found in storage (expected)")
-
                 return True
-            else:
-                logger.debug(f"No checkpoints found for thread {thread_id}")
-                return False
+
+            logger.debug(f"No conversation history found for thread {thread_id}")
+            return False
 
         logger.warning(f"Could not access storage to clear thread {thread_id}")
         return False
@@ -288,7 +266,7 @@ def track_checkpoint_creation(thread_id: str):
     """
     global _checkpoint_timestamps
     thread_key = (thread_id,)
-    _checkpoint_timestamps[thread_key] = datetime.now()
+    _checkpoint_timestamps[thread_key] = time.monotonic()
     logger.debug(f"Tracked checkpoint creation for thread {thread_id}")
 
 
@@ -316,9 +294,10 @@ def cleanup_expired_checkpoints(ttl_minutes: int = 5) -> dict:
         }
 
     try:
-        now = datetime.now()
-        grace_period = timedelta(seconds=30)
-        ttl_threshold = timedelta(minutes=ttl_minutes) + grace_period
+        # Monotonic clock so wall-clock jumps can't expire or extend sessions
+        now = time.monotonic()
+        grace_period = 30
+        ttl_threshold = ttl_minutes * 60 + grace_period
 
         deleted_count = 0
         processed_count = 0
@@ -347,7 +326,7 @@ def cleanup_expired_checkpoints(ttl_minutes: int = 5) -> dict:
                     del _memory_saver_instance.storage[thread_key]
                     del _checkpoint_timestamps[thread_key]
                     deleted_count += 1
-                    logger.info(f"Removed expired checkpoint {thread_key} (age: {checkpoint_age})")
+                    logger.info(f"Removed expired checkpoint {thread_key} (age: {checkpoint_age:.0f}s)")
             else:
                 # No timestamp - assume it was created now to give it full TTL
                 _checkpoint_timestamps[thread_key] = now
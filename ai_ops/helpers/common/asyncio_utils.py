@@ -63,3 +63,48 @@ def get_or_create_event_loop_lock(lock_ref: list[Optional[asyncio.Lock]], lock_n
         logger.warning(f"Error managing {lock_name}, recreating: {e}")
         lock_ref[0] = asyncio.Lock()
         return lock_ref[0]
+
+
+def install_eager_task_factory(loop: Optional[asyncio.AbstractEventLoop] = None) -> bool:
+    """Install ``asyncio.eager_task_factory`` on an event loop when supported.
+
+    Eager tasks start executing synchronously inside ``create_task()`` /
+    ``gather()`` and only get scheduled on the loop once they actually
+    suspend.  Coroutines that finish without blocking (cache hits, already
+    resolved futures) therefore skip a full event-loop iteration.
+
+    ``eager_task_factory`` only exists on Python 3.12+; on older interpreters
+    this is a no-op.  A loop that already has a custom task factory is left
+    untouched.
+
+    Args:
+        loop: Loop to configure. Defaults to the running loop.
+
+    Returns:
+        bool: ``True`` if the eager task factory is active on the loop.
+
+    Example:
+        >>> loop = asyncio.new_event_loop()
+        >>> install_eager_task_factory(loop)
+        >>> loop.run_until_complete(main())
+    """
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is None:
+        return False
+
+    if loop is None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+
+    current_factory = loop.get_task_factory()
+    if current_factory is eager_task_factory:
+        return True
+    if current_factory is not None:
+        logger.debug("Loop already has a custom task factory; not installing eager_task_factory")
+        return False
+
+    loop.set_task_factory(eager_task_factory)
+    logger.debug("Installed asyncio.eager_task_factory on event loop")
+    return True
@@ -0,0 +1,38 @@
+"""Shared HTTP settings for MCP server connections.
+
+Both the multi-MCP agent and the deep agent's authenticated MCP tools pool
+their connections to MCP servers; this module keeps the HTTP/2 detection and
+the connection pool limits in one place so the two pools stay in step.
+
+Configuration (app settings):
+- mcp_client_max_connections: Maximum concurrent connections per pool
+- mcp_client_max_keepalive_connections: Maximum idle connections kept alive per pool
+"""
+
+import importlib.util
+
+import httpx
+from nautobot.apps.config import get_app_settings_or_config
+
+# HTTP/2 multiplexing requires the optional ``h2`` package (``httpx[http2]``)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Connection pool limits for MCP HTTP clients, read from app settings on first use
+_mcp_client_limits: httpx.Limits | None = None
+
+
+def get_mcp_client_limits() -> httpx.Limits:
+    """Return connection pool limits for MCP HTTP clients.
+
+    Limits come from the ``mcp_client_max_connections`` and
+    ``mcp_client_max_keepalive_connections`` app settings and are cached after
+    the first read so client factories never touch settings per request.
+    """
+    global _mcp_client_limits
+    if _mcp_client_limits is None:
+        _mcp_client_limits = httpx.Limits(
+            max_connections=get_app_settings_or_config("ai_ops", "mcp_client_max_connections"),
+            max_keepalive_connections=get_app_settings_or_config("ai_ops", "mcp_client_max_keepalive_connections"),
+            keepalive_expiry=30.0,
+        )
+    return _mcp_client_limits
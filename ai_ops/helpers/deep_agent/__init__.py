@@ -11,21 +11,40 @@ architecture including:
 - Skills system
 """
 
-from .agents_loader import load_agents
+from .agents_loader import build_subagents, load_agents, read_agent_specs
 from .backend_factory import create_composite_backend
-from .checkpoint_factory import get_checkpointer
-from .mcp_tools_auth import get_mcp_tools
+from .checkpoint_factory import clear_checkpointer_cache, close_all_pools, get_checkpointer
+from .mcp_tools_auth import close_mcp_transport, get_mcp_tools
 from .middleware import ToolErrorHandlerMiddleware, ToolResultCacheMiddleware, close_tool_cache_redis
-from .store_factory import get_store, managed_store
+from .response_cache import (
+    RESPONSE_CACHE_ENABLED,
+    build_response_cache_key,
+    evict_thread_responses,
+    get_cached_response,
+    store_cached_response,
+)
+from .store_factory import clear_store_cache, close_all_stores, get_store, managed_store
 
 __all__ = [
     "get_checkpointer",
+    "clear_checkpointer_cache",
+    "close_all_pools",
     "get_store",
+    "clear_store_cache",
+    "close_all_stores",
     "managed_store",
     "ToolErrorHandlerMiddleware",
     "ToolResultCacheMiddleware",
     "close_tool_cache_redis",
+    "RESPONSE_CACHE_ENABLED",
+    "build_response_cache_key",
+    "evict_thread_responses",
+    "get_cached_response",
+    "store_cached_response",
     "get_mcp_tools",
+    "close_mcp_transport",
     "load_agents",
+    "read_agent_specs",
+    "build_subagents",
     "create_composite_backend",
 ]
@@ -12,7 +12,8 @@ Not part of the public package API — imported only by sibling factory modules.
 import asyncio
 import logging
 import os
-from typing import Any
+import time
+from typing import Any, Awaitable, Callable
 
 logger = logging.getLogger(__name__)
 
@@ -89,9 +90,11 @@ def get_redis_url(*preferred_env_vars: str) -> str | None:
     if fallback and preferred_env_vars:
         missing = ", ".join(preferred_env_vars)
         logger.warning(
-            f"Neither {missing} is set — falling back to REDIS_URL. "
-            f"Set {preferred_env_vars[0]} to an explicit /0 URL for clarity, "
-            f"e.g. redis://:password@host:6379/0 (RediSearch requires db=0)."
+            "Neither %s is set — falling back to REDIS_URL. "
+            "Set %s to an explicit /0 URL for clarity, "
+            "e.g. redis://:password@host:6379/0 (RediSearch requires db=0).",
+            missing,
+            preferred_env_vars[0],
         )
     return fallback
 
@@ -116,7 +119,51 @@ async def close_redis_connection(obj: Any, agent_name: str) -> None:
         if hasattr(obj, "_redis") and obj._redis is not None:
             await obj._redis.aclose()
     except Exception as exc:
-        logger.debug(f"[{agent_name}] Error closing Redis connection: {exc}")
+        logger.debug("[%s] Error closing Redis connection: %s", agent_name, exc)
+
+
+# ---------------------------------------------------------------------------
+# Liveness checks
+# ---------------------------------------------------------------------------
+
+# Cached connections are probed at most once per interval before reuse, so a
+# dead connection is replaced up front instead of failing the next request.
+LIVENESS_CHECK_INTERVAL: float = float(os.getenv("CONNECTION_LIVENESS_INTERVAL", "30"))
+LIVENESS_CHECK_TIMEOUT: float = float(os.getenv("CONNECTION_LIVENESS_TIMEOUT", "2"))
+
+
+async def is_connection_alive(
+    metadata: Any,
+    ping: Callable[[], Awaitable[Any]],
+    agent_name: str,
+    kind: str,
+) -> bool:
+    """Return whether a cached connection is still usable, probing it when due.
+
+    The probe (Redis ``PING`` / Postgres ``SELECT 1``) only runs when
+    ``LIVENESS_CHECK_INTERVAL`` seconds have passed since ``metadata.last_checked``,
+    so the hot path normally costs a clock read.
+
+    Args:
+        metadata: Cache entry with a ``last_checked`` monotonic timestamp, updated on success.
+        ping: Zero-argument coroutine factory performing the round trip.
+        agent_name: Agent name used in log messages.
+        kind: Resource description used in log messages (e.g. ``"Redis checkpointer"``).
+
+    Returns:
+        ``True`` if the connection is alive or was checked recently, ``False`` if the probe failed.
+    """
+    now = time.monotonic()
+    if LIVENESS_CHECK_INTERVAL <= 0 or now - metadata.last_checked < LIVENESS_CHECK_INTERVAL:
+        return True
+    try:
+        async with asyncio.timeout(LIVENESS_CHECK_TIMEOUT):
+            await ping()
+    except Exception as exc:
+        logger.warning("[%s] Cached %s failed liveness check, recreating: %s", agent_name, kind, exc)
+        return False
+    metadata.last_checked = now
+    return True
 
 
 # ---------------------------------------------------------------------------
@@ -166,10 +213,19 @@ def log_redis_fallback(
     auth_error = is_redis_auth_error(error)
 
     if is_dev and auth_error:
-        logger.info(f"[{agent_name}] Redis auth failed in DEV ({error_type}). Falling back to {fallback_description}.")
+        logger.info(
+            "[%s] Redis auth failed in DEV (%s). Falling back to %s.",
+            agent_name,
+            error_type,
+            fallback_description,
+        )
     else:
         logger.warning(
-            f"[{agent_name}] Redis error ({error_type}): {error_msg}. Falling back to {fallback_description}."
+            "[%s] Redis error (%s): %s. Falling back to %s.",
+            agent_name,
+            error_type,
+            error_msg,
+            fallback_description,
         )
 
 
@@ -20,87 +20,116 @@ import yaml
 logger = logging.getLogger(__name__)
 
 
-async def load_agents(config_path: str | Path, tools: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
+def read_agent_specs(config_path: str | Path) -> Dict[str, Any]:
     """
-    Load subagent definitions from YAML and wire up tools.
+    Read and parse subagent definitions from YAML without binding any tools.
+
+    Use this once (e.g. at import) and pass the result to :func:`build_subagents`
+    on every build, so the file is only read and parsed a single time.
 
     Args:
         config_path: Path to the YAML configuration file (string or Path object)
+
+    Returns:
+        Mapping of subagent name to its raw specification, or an empty dict if the
+        file is missing, empty or unreadable.
+    """
+    config_path = Path(config_path)
+
+    if not config_path.exists():
+        logger.warning("Subagent configuration file not found: %s", config_path)
+        return {}
+
+    try:
+        with open(config_path, encoding="utf-8") as f:
+            specs = yaml.safe_load(f)
+    except yaml.YAMLError as e:
+        logger.error("Error parsing YAML configuration %s: %s", config_path, e)
+        return {}
+    except OSError as e:
+        logger.error("Error reading configuration file %s: %s", config_path, e)
+        return {}
+
+    if not specs:
+        logger.info("Empty subagent configuration: %s", config_path)
+        return {}
+    if not isinstance(specs, dict):
+        logger.error("Subagent configuration %s must be a mapping of name to spec", config_path)
+        return {}
+    return specs
+
+
+def build_subagents(specs: Dict[str, Any], tools: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
+    """
+    Build subagent configurations from parsed specifications and wire up tools.
+
+    Args:
+        specs: Parsed subagent specifications, as returned by :func:`read_agent_specs`
         tools: Dictionary mapping tool names to actual tool objects/functions
                Example: {"mcp_tools": [list_of_tools]}
 
     Returns:
         List of subagent configuration dictionaries
+    """
+    tools = tools or {}
+    agents = []
+
+    for name, spec in (specs or {}).items():
+        agent = {
+            "name": name,
+            "description": spec.get("description", ""),
+            "system_prompt": spec.get("system_prompt", ""),
+        }
+
+        # Add optional model configuration
+        if "model" in spec:
+            agent["model"] = spec["model"]
+
+        # Wire up tools if specified
+        if "tools" in spec and tools:
+            agent_tools = []
+            for tool_name in spec["tools"]:
+                if tool_name not in tools:
+                    logger.warning(
+                        "Tool '%s' referenced in subagent '%s' is not available - skipping",
+                        tool_name,
+                        name,
+                    )
+                    continue
+
+                tool_value = tools[tool_name]
+                # If the tool value is a list, extend; otherwise append
+                if isinstance(tool_value, list):
+                    agent_tools.extend(tool_value)
+                else:
+                    agent_tools.append(tool_value)
+
+            agent["tools"] = agent_tools
+
+        agents.append(agent)
+
+    return agents
+
 
-    Raises:
-        FileNotFoundError: If the configuration file doesn't exist
-        IOError: If there's an error reading the file
-        KeyError: If a tool referenced in config is not available
-        yaml.YAMLError: If the YAML file is malformed
+async def load_agents(config_path: str | Path, tools: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
     """
-    # Convert string to Path if needed
-    config_path = Path(config_path) if isinstance(config_path, str) else config_path
+    Load subagent definitions from YAML and wire up tools.
 
-    if not config_path.exists():
-        logger.warning(f"Subagent configuration file not found: {config_path}")
-        return []
+    Convenience wrapper around :func:`read_agent_specs` and :func:`build_subagents`
+    that reads the file off the event loop. Callers that build agents repeatedly
+    should read the specs once and call :func:`build_subagents` instead.
 
-    try:
-        # Use asyncio.to_thread for non-blocking file reading
-        def read_config_sync():
-            with open(config_path, encoding="utf-8") as f:
-                return yaml.safe_load(f)
-
-        config = await asyncio.to_thread(read_config_sync)
-
-        if not config:
-            logger.info(f"Empty subagent configuration: {config_path}")
-            return []
-
-        tools = tools or {}
-        agents = []
-
-        for name, spec in config.items():
-            agent = {
-                "name": name,
-                "description": spec.get("description", ""),
-                "system_prompt": spec.get("system_prompt", ""),
-            }
-
-            # Add optional model configuration
-            if "model" in spec:
-                agent["model"] = spec["model"]
-
-            # Wire up tools if specified
-            if "tools" in spec and tools:
-                agent_tools = []
-                for tool_name in spec["tools"]:
-                    if tool_name not in tools:
-                        logger.warning(
-                            f"Tool '{tool_name}' referenced in subagent '{name}' is not available - skipping"
-                        )
-                        continue
-
-                    tool_value = tools[tool_name]
-                    # If the tool value is a list, extend; otherwise append
-                    if isinstance(tool_value, list):
-                        agent_tools.extend(tool_value)
-                    else:
-                        agent_tools.append(tool_value)
-
-                agent["tools"] = agent_tools
-
-            agents.append(agent)
-
-        logger.info(f"Loaded {len(agents)} subagent(s) from {config_path}")
-        return agents
+    Args:
+        config_path: Path to the YAML configuration file (string or Path object)
+        tools: Dictionary mapping tool names to actual tool objects/functions
+               Example: {"mcp_tools": [list_of_tools]}
 
-    except yaml.YAMLError as e:
-        logger.error(f"Error parsing YAML configuration {config_path}: {e}")
-        return []
-    except OSError as e:
-        logger.error(f"Error reading configuration file {config_path}: {e}")
-        return []
-    except Exception as e:
-        logger.error(f"Unexpected error loading subagents from {config_path}: {e}")
-        return []
+    Returns:
+        List of subagent configuration dictionaries, empty if the file is
+        missing, empty or unreadable.
+    """
+    specs = await asyncio.to_thread(read_agent_specs, config_path)
+    agents = build_subagents(specs, tools)
+    if agents:
+        logger.info("Loaded %s subagent(s) from %s", len(agents), config_path)
+    return agents
@@ -42,7 +42,7 @@ def create_composite_backend(runtime: Runtime, root_dir: str = ".") -> Composite
         )
         ```
     """
-    logger.debug(f"Creating CompositeBackend with root_dir={root_dir}")
+    logger.debug("Creating CompositeBackend with root_dir=%s", root_dir)
 
     return CompositeBackend(
         default=FilesystemBackend(root_dir=root_dir, virtual_mode=True), routes={"/memories/": StoreBackend(runtime)}
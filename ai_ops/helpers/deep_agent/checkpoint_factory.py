@@ -15,7 +15,8 @@ Example:
 import asyncio
 import logging
 import os
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from typing import Any
 
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
@@ -28,6 +29,7 @@ from ._utils import (
     get_current_event_loop,
     get_postgres_connection_string,
     get_redis_url,
+    is_connection_alive,
     is_dev_environment,
     log_redis_fallback,
 )
@@ -47,6 +49,7 @@ class CheckpointerMetadata:
     event_loop: asyncio.AbstractEventLoop | None
     pool: PostgresPool | None = None  # For PostgreSQL only
     context_manager: Any | None = None  # For Redis: async CM returned by from_conn_string()
+    last_checked: float = field(default_factory=time.monotonic)  # Last successful liveness probe
 
 
 # Global checkpointer cache per agent
@@ -77,7 +80,7 @@ async def _close_checkpointer_cm(cm: Any, agent_name: str) -> None:
     try:
         await cm.__aexit__(None, None, None)
     except Exception as exc:
-        logger.debug(f"[{agent_name}] Error closing checkpointer context manager: {exc}")
+        logger.debug("[%s] Error closing checkpointer context manager: %s", agent_name, exc)
 
 
 async def _create_redis_checkpointer(redis_url: str, agent_name: str) -> tuple[AsyncRedisSaver, Any]:
@@ -97,7 +100,7 @@ async def _create_redis_checkpointer(redis_url: str, agent_name: str) -> tuple[A
     ttl_config = _get_ttl_config()
     default_ttl = ttl_config["default_ttl"] * 60  # Convert back to seconds for logging
 
-    logger.info(f"[{agent_name}] Creating AsyncRedisSaver with TTL={default_ttl}s")
+    logger.info("[%s] Creating AsyncRedisSaver with TTL=%ss", agent_name, default_ttl)
 
     # from_conn_string() returns an async context manager; enter it to get the
     # live checkpointer.  Return the CM so the caller can store it for __aexit__.
@@ -108,7 +111,7 @@ async def _create_redis_checkpointer(redis_url: str, agent_name: str) -> tuple[A
     cm = AsyncRedisSaver.from_conn_string(redis_url, ttl=ttl_config)
     checkpointer = await cm.__aenter__()
 
-    logger.info(f"[{agent_name}] \u2713 Redis checkpointer created successfully")
+    logger.info("[%s] Redis checkpointer created successfully", agent_name)
     return checkpointer, cm
 
 
@@ -129,18 +132,22 @@ async def _create_postgres_pool(agent_name: str, conninfo: str) -> PostgresPool:
     pool_max_size = int(os.getenv("CHECKPOINT_POOL_SIZE", "10"))
     pool_min_size = int(os.getenv("CHECKPOINT_POOL_MIN_SIZE", "2"))
 
-    logger.info(f"[{agent_name}] Creating PostgreSQL connection pool (max={pool_max_size}, min={pool_min_size})")
+    logger.info("[%s] Creating PostgreSQL connection pool (max=%s, min=%s)", agent_name, pool_max_size, pool_min_size)
 
     pool: PostgresPool = AsyncConnectionPool(
         conninfo=conninfo,
         max_size=pool_max_size,
         min_size=pool_min_size,
+        # Close idle connections above min_size after this many seconds
+        max_idle=float(os.getenv("CHECKPOINT_POOL_MAX_IDLE", "300")),
         open=False,
+        # Validate connections on checkout so ones dropped by the server are replaced
+        check=AsyncConnectionPool.check_connection,
         kwargs={"autocommit": True, "row_factory": dict_row},
     )
 
     await pool.open()
-    logger.info(f"[{agent_name}] ✓ PostgreSQL pool created successfully")
+    logger.info("[%s] PostgreSQL pool created successfully", agent_name)
     return pool
 
 
@@ -181,7 +188,7 @@ def _should_recreate_for_event_loop(
         return False
 
     if stored.is_closed():
-        logger.debug(f"[{agent_name}] Stored event loop is closed — recreating checkpointer")
+        logger.debug("[%s] Stored event loop is closed — recreating checkpointer", agent_name)
         return True
 
     return False
@@ -207,15 +214,17 @@ async def _get_or_create_redis_checkpointer(redis_url: str, agent_name: str) ->
     if agent_name in _checkpointers:
         metadata = _checkpointers[agent_name]
 
-        # Verify event loop compatibility
-        if _should_recreate_for_event_loop(metadata, current_loop, agent_name):
+        # Verify event loop compatibility and that the connection still answers
+        if _should_recreate_for_event_loop(metadata, current_loop, agent_name) or not await is_connection_alive(
+            metadata, metadata.checkpointer._redis.ping, agent_name, "Redis checkpointer"
+        ):
             # Close old checkpointer via its context manager
             if metadata.context_manager is not None:
                 await _close_checkpointer_cm(metadata.context_manager, agent_name)
             del _checkpointers[agent_name]
         else:
             # Return cached checkpointer
-            logger.debug(f"[{agent_name}] Reusing cached Redis checkpointer")
+            logger.debug("[%s] Reusing cached Redis checkpointer", agent_name)
             return metadata.checkpointer
 
     # Create new checkpointer
@@ -256,17 +265,17 @@ async def _get_or_create_postgres_checkpointer(agent_name: str) -> AsyncPostgres
         if _should_recreate_for_event_loop(metadata, current_loop, agent_name):
             # Close old pool
             if metadata.pool:
-                logger.info(f"[{agent_name}] Closing old PostgreSQL pool (event loop changed)")
+                logger.info("[%s] Closing old PostgreSQL pool (event loop changed)", agent_name)
                 await metadata.pool.close()
             del _checkpointers[agent_name]
         else:
             # Create new checkpointer instance with existing pool
             # Note: AsyncPostgresSaver requires a fresh instance per call
             if not metadata.pool:
-                logger.warning(f"[{agent_name}] Pool metadata missing, recreating")
+                logger.warning("[%s] Pool metadata missing, recreating", agent_name)
                 del _checkpointers[agent_name]
             else:
-                logger.debug(f"[{agent_name}] Reusing cached PostgreSQL pool")
+                logger.debug("[%s] Reusing cached PostgreSQL pool", agent_name)
                 checkpointer = AsyncPostgresSaver(metadata.pool)
                 await checkpointer.setup()
                 return checkpointer
@@ -285,7 +294,7 @@ async def _get_or_create_postgres_checkpointer(agent_name: str) -> AsyncPostgres
         pool=pool,
     )
 
-    logger.info(f"[{agent_name}] ✓ PostgreSQL checkpointer created successfully")
+    logger.info("[%s] PostgreSQL checkpointer created successfully", agent_name)
     return checkpointer
 
 
@@ -326,6 +335,15 @@ async def get_checkpointer(agent_name: str = "deep_agent") -> CheckpointerType:
     return await _get_or_create_postgres_checkpointer(agent_name)
 
 
+def clear_checkpointer_cache() -> None:
+    """Forget every cached checkpointer without closing it.
+
+    Used to recover when cached connections are bound to a dead event loop and
+    can no longer be closed cleanly; the next request recreates them.
+    """
+    _checkpointers.clear()
+
+
 async def close_all_pools() -> None:
     """
     Close all connection pools and Redis checkpointers gracefully.
@@ -340,23 +358,23 @@ async def close_all_pools() -> None:
         logger.debug("No checkpointers to close")
         return
 
-    logger.info(f"Closing {len(_checkpointers)} checkpointer(s)")
+    logger.info("Closing %s checkpointer(s)", len(_checkpointers))
 
     for agent_name, metadata in list(_checkpointers.items()):
         try:
             # Close Redis checkpointer via its context manager
             if isinstance(metadata.checkpointer, AsyncRedisSaver):
-                logger.info(f"[{agent_name}] Closing Redis checkpointer")
+                logger.info("[%s] Closing Redis checkpointer", agent_name)
                 if metadata.context_manager is not None:
                     await _close_checkpointer_cm(metadata.context_manager, agent_name)
 
             # Close PostgreSQL pool
             elif isinstance(metadata.checkpointer, AsyncPostgresSaver) and metadata.pool:
-                logger.info(f"[{agent_name}] Closing PostgreSQL connection pool")
+                logger.info("[%s] Closing PostgreSQL connection pool", agent_name)
                 await metadata.pool.close()
 
         except Exception as e:
-            logger.warning(f"[{agent_name}] Error closing checkpointer: {e}")
+            logger.warning("[%s] Error closing checkpointer: %s", agent_name, e)
 
     _checkpointers.clear()
     logger.info("✓ All checkpointers closed successfully")
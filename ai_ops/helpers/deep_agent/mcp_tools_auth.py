@@ -20,7 +20,9 @@ Example:
     >>> tools = await get_mcp_tools(agent_name="my_agent")
 """
 
+import asyncio
 import logging
+import weakref
 from typing import Any
 
 import httpx
@@ -28,6 +30,7 @@ from asgiref.sync import sync_to_async
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from nautobot.extras.models import Status
 
+from ai_ops.helpers.common.mcp_http import HTTP2_AVAILABLE, get_mcp_client_limits
 from ai_ops.models import MCPServer
 
 logger = logging.getLogger(__name__)
@@ -35,6 +38,52 @@ logger = logging.getLogger(__name__)
 # Type alias for tool lists
 ToolList = list[Any]
 
+# One connection pool per event loop, shared by every user's MCP sessions
+_shared_transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_shared_transport() -> httpx.AsyncHTTPTransport:
+    """Return the pooled transport for the running event loop, creating it on first use.
+
+    Uses the same ``mcp_client_*`` pool limits as the multi-MCP agent.
+    """
+    loop = asyncio.get_running_loop()
+    transport = _shared_transports.get(loop)
+    if transport is None:
+        transport = httpx.AsyncHTTPTransport(
+            verify=False,  # noqa: S501 - intentional per requirements
+            http2=HTTP2_AVAILABLE,
+            limits=get_mcp_client_limits(),
+        )
+        _shared_transports[loop] = transport
+    return transport
+
+
+class _PooledTransport(httpx.AsyncBaseTransport):
+    """Transport that sends through the shared pool and leaves it open on close.
+
+    The MCP transports close their httpx client at the end of every session,
+    which would otherwise tear down the shared connection pool with it.
+    """
+
+    def __init__(self, pool: httpx.AsyncHTTPTransport):
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._pool.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        return None
+
+
+async def close_mcp_transport() -> None:
+    """Close the shared MCP connection pool bound to the running event loop, if any."""
+    transport = _shared_transports.pop(asyncio.get_running_loop(), None)
+    if transport is not None:
+        await transport.aclose()
+
 
 def _create_httpx_client_factory(user_token: str | None = None):
     """
@@ -48,7 +97,8 @@ def _create_httpx_client_factory(user_token: str | None = None):
 
     Note:
         SSL verification is disabled per requirements for internal servers
-        with self-signed certificates.
+        with self-signed certificates. Clients only carry the auth header;
+        connections come from the shared per-loop pool.
     """
 
     def factory(**_kwargs):
@@ -61,13 +111,9 @@ def _create_httpx_client_factory(user_token: str | None = None):
             headers["Authorization"] = auth_header
 
         return httpx.AsyncClient(
-            verify=False,  # noqa: S501 - intentional per requirements
             headers=headers,
             timeout=httpx.Timeout(30.0),  # Prevent hanging
-            limits=httpx.Limits(
-                max_keepalive_connections=5,
-                max_connections=10,
-            ),
+            transport=_PooledTransport(_get_shared_transport()),
         )
 
     return factory
@@ -94,9 +140,9 @@ async def _get_healthy_mcp_servers(agent_name: str) -> list[MCPServer]:
     )
 
     if not servers:
-        logger.warning(f"[{agent_name}] No enabled, healthy MCP servers found")
+        logger.warning("[%s] No enabled, healthy MCP servers found", agent_name)
     else:
-        logger.info(f"[{agent_name}] Found {len(servers)} healthy MCP server(s)")
+        logger.info("[%s] Found %s healthy MCP server(s)", agent_name, len(servers))
 
     return servers
 
@@ -118,7 +164,7 @@ def _build_mcp_connections(
     return {
         server.name: {
             "transport": "streamable_http",
-            "url": f"{server.url.rstrip('/')}{server.mcp_endpoint}",
+            "url": server.full_mcp_url,
             "httpx_client_factory": httpx_factory,
         }
         for server in servers
@@ -168,36 +214,28 @@ async def get_mcp_tools(
         tools = await client.get_tools()
 
         auth_msg = "with auth" if user_token else "without auth"
-        logger.info(f"[{agent_name}] Loaded {len(tools)} tools from {len(servers)} MCP server(s) {auth_msg}")
+        logger.info("[%s] Loaded %s tools from %s MCP server(s) %s", agent_name, len(tools), len(servers), auth_msg)
 
         return tools
 
     except Status.DoesNotExist:
         logger.error(
-            f"[{agent_name}] 'Healthy' status not found in database. Please ensure Nautobot statuses are configured.",
+            "[%s] 'Healthy' status not found in database. Please ensure Nautobot statuses are configured.",
+            agent_name,
             exc_info=True,
         )
         return []
 
     except (httpx.HTTPError, httpx.TimeoutException) as e:
-        logger.error(
-            f"[{agent_name}] HTTP error connecting to MCP servers: {e}",
-            exc_info=True,
-        )
+        logger.error("[%s] HTTP error connecting to MCP servers: %s", agent_name, e, exc_info=True)
         return []
 
     except ValueError as e:
-        logger.error(
-            f"[{agent_name}] Invalid configuration for MCP servers: {e}",
-            exc_info=True,
-        )
+        logger.error("[%s] Invalid configuration for MCP servers: %s", agent_name, e, exc_info=True)
         return []
 
     except Exception as e:
         # Unexpected errors should be visible for debugging
-        logger.critical(
-            f"[{agent_name}] Unexpected error loading MCP tools: {e}",
-            exc_info=True,
-        )
+        logger.critical("[%s] Unexpected error loading MCP tools: %s", agent_name, e, exc_info=True)
         # Still return empty list to allow agent to work
         return []
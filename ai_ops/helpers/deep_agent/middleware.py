@@ -60,7 +60,7 @@ async def _get_shared_redis() -> aioredis.Redis | None:
         logger.info("[TOOL_CACHE] Shared Redis connection established")
         return _shared_redis
     except Exception as e:
-        logger.warning(f"[TOOL_CACHE] Redis unavailable, caching disabled: {e}")
+        logger.warning("[TOOL_CACHE] Redis unavailable, caching disabled: %s", e)
         _shared_redis_unavailable = True
         return None
 
@@ -77,7 +77,7 @@ async def close_tool_cache_redis() -> None:
             await _shared_redis.aclose()
             logger.info("[TOOL_CACHE] Shared Redis connection closed")
         except Exception as exc:
-            logger.debug(f"[TOOL_CACHE] Error closing shared Redis: {exc}")
+            logger.debug("[TOOL_CACHE] Error closing shared Redis: %s", exc)
         finally:
             _shared_redis = None
             _shared_redis_unavailable = False
@@ -149,7 +149,7 @@ class ToolErrorHandlerMiddleware(AgentMiddleware):
 
                 # Log successful retry
                 if attempt > 0:
-                    logger.info(f"[TOOL_CALL] ✓ Tool '{tool_name}' succeeded on attempt {attempt + 1}")
+                    logger.info("[TOOL_CALL] Tool '%s' succeeded on attempt %s", tool_name, attempt + 1)
                 return result
 
             except Exception as e:
@@ -158,8 +158,12 @@ class ToolErrorHandlerMiddleware(AgentMiddleware):
 
                 # Log attempt
                 logger.warning(
-                    f"[TOOL_CALL] ✗ Tool '{tool_name}' attempt {attempt + 1}/{self.max_retries + 1}: "
-                    f"{type(e).__name__} (retriable={is_retriable})"
+                    "[TOOL_CALL] Tool '%s' attempt %s/%s: %s (retriable=%s)",
+                    tool_name,
+                    attempt + 1,
+                    self.max_retries + 1,
+                    type(e).__name__,
+                    is_retriable,
                 )
 
                 # Break if last attempt or not retriable
@@ -173,7 +177,7 @@ class ToolErrorHandlerMiddleware(AgentMiddleware):
             f"Tool error: {repr(last_error)}\n\nPlease try a different approach or ask for clarification if needed."
         )
 
-        logger.error(f"[TOOL_CALL] ✗ Tool '{tool_name}' failed after {self.max_retries + 1} attempts")
+        logger.error("[TOOL_CALL] Tool '%s' failed after %s attempts", tool_name, self.max_retries + 1)
 
         return ToolMessage(content=error_msg, tool_call_id=request.tool_call["id"], name=tool_name, status="error")
 
@@ -280,7 +284,7 @@ class ToolResultCacheMiddleware(AgentMiddleware):
             try:
                 cached = await r.get(cache_key)
                 if cached is not None:
-                    logger.info(f"[TOOL_CACHE] HIT tool={tool_name} key={cache_key}")
+                    logger.info("[TOOL_CACHE] HIT tool=%s key=%s", tool_name, cache_key)
                     cached_data = json.loads(cached)
                     return ToolMessage(
                         content=cached_data["content"],
@@ -288,10 +292,10 @@ class ToolResultCacheMiddleware(AgentMiddleware):
                         name=tool_name,
                     )
             except Exception as e:
-                logger.warning(f"[TOOL_CACHE] Redis read error, falling through: {e}")
+                logger.warning("[TOOL_CACHE] Redis read error, falling through: %s", e)
 
         # Cache miss — execute tool
-        logger.info(f"[TOOL_CACHE] MISS tool={tool_name} key={cache_key}")
+        logger.info("[TOOL_CACHE] MISS tool=%s key=%s", tool_name, cache_key)
         result = await handler(request)
 
         # Cache the result if Redis is available and tool succeeded
@@ -300,8 +304,8 @@ class ToolResultCacheMiddleware(AgentMiddleware):
             try:
                 cache_data = json.dumps({"content": result_content})
                 await r.setex(cache_key, ttl, cache_data)
-                logger.info(f"[TOOL_CACHE] SET tool={tool_name} key={cache_key} ttl={ttl}s")
+                logger.info("[TOOL_CACHE] SET tool=%s key=%s ttl=%ss", tool_name, cache_key, ttl)
             except Exception as e:
-                logger.warning(f"[TOOL_CACHE] Redis write error: {e}")
+                logger.warning("[TOOL_CACHE] Redis write error: %s", e)
 
         return result
@@ -0,0 +1,197 @@
+"""
+Response cache for deep agent conversations in ai-ops.
+
+Short-circuits the full agent run when a user repeats the question they just
+asked (a resubmit or retry).  Prompts are normalised (case,
+whitespace, trailing punctuation) before hashing, so trivial rewording such as
+``"List sites"`` vs ``"list sites?"`` hits the same entry.
+
+Only responses produced without any tool calls are stored — answers that
+touched live Nautobot data must always be recomputed.
+
+Entries live in the shared tool-cache Redis connection and are scoped by
+``(thread_id, latest checkpoint id, user token digest, provider, model pk)``.
+An answer is stored under the checkpoint its own run produced and looked up
+under the thread's checkpoint before the next run, so it is replayed only while
+the conversation has not moved on.  A replayed answer is not written to the
+thread, so repeating the prompt again keeps hitting the same entry.  Cached
+answers never leak between users, conversations or models, and a follow-up such
+as ``"why?"`` is never answered from an earlier point in the conversation.  Each thread's keys are indexed so clearing a conversation
+evicts them (:func:`evict_thread_responses`).
+
+A bounded in-process LRU sits in front of Redis so repeat lookups served by
+the same worker skip the network round trip entirely.
+
+Configuration:
+- RESPONSE_CACHE_ENABLED: Enable the cache (default: false)
+- RESPONSE_CACHE_TTL: Entry lifetime in seconds (default: 600)
+- RESPONSE_CACHE_LOCAL_SIZE: Max entries in the in-process LRU (default: 4096, 0 disables)
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from .middleware import _get_shared_redis
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() in ("true", "1", "yes", "on")
+RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", "600"))
+RESPONSE_CACHE_LOCAL_SIZE: int = int(os.getenv("RESPONSE_CACHE_LOCAL_SIZE", "4096"))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TRAILING_PUNCT_RE = re.compile(r"[\s?.!]+$")
+
+# In-process LRU: key -> (monotonic expiry, response)
+_local_cache: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+_local_cache_lock = threading.Lock()
+
+
+def _local_get(key: str) -> str | None:
+    """Return a live entry from the in-process LRU, evicting it if expired."""
+    with _local_cache_lock:
+        entry = _local_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _local_cache[key]
+            return None
+        _local_cache.move_to_end(key)
+        return entry[1]
+
+
+def _local_set(key: str, response: str, ttl: float) -> None:
+    """Insert into the in-process LRU, evicting the least recently used entries."""
+    if RESPONSE_CACHE_LOCAL_SIZE <= 0:
+        return
+    with _local_cache_lock:
+        _local_cache[key] = (time.monotonic() + ttl, response)
+        _local_cache.move_to_end(key)
+        while len(_local_cache) > RESPONSE_CACHE_LOCAL_SIZE:
+            _local_cache.popitem(last=False)
+
+
+def clear_local_response_cache() -> None:
+    """Drop every entry from the in-process LRU (Redis entries are untouched)."""
+    with _local_cache_lock:
+        _local_cache.clear()
+
+
+def normalize_prompt(text: str) -> str:
+    """Normalise a user prompt for cache lookups.
+
+    Args:
+        text: Raw user input.
+
+    Returns:
+        Casefolded prompt with collapsed whitespace and no trailing punctuation.
+    """
+    return _TRAILING_PUNCT_RE.sub("", _WHITESPACE_RE.sub(" ", text.strip().casefold()))
+
+
+def _thread_digest(thread_id: str) -> str:
+    """Return the short digest that prefixes every key of a thread."""
+    return hashlib.sha256(thread_id.encode()).hexdigest()[:16]
+
+
+def _thread_index_key(thread_digest: str) -> str:
+    """Return the Redis set holding the response keys stored for a thread."""
+    return f"response_cache_thread:{thread_digest}"
+
+
+def build_response_cache_key(
+    user_input: str,
+    thread_id: str,
+    checkpoint_id: str | None = None,
+    token_scope: str | None = None,
+    provider: str | None = None,
+    model_pk: object = None,
+) -> str:
+    """Build a deterministic Redis key for a prompt within a user/thread scope.
+
+    Args:
+        user_input: Raw user prompt.
+        thread_id: Conversation thread.
+        checkpoint_id: The thread's latest checkpoint id (``None`` for a new thread);
+            the post-run checkpoint when storing, the pre-run one when looking up.
+        token_scope: Digest of the user's API token; never the raw token.
+        provider: Optional provider override.
+        model_pk: Primary key of the LLM model answering the request.
+    """
+    scope = "\x1f".join(
+        (
+            thread_id,
+            checkpoint_id or "",
+            token_scope or "",
+            provider or "",
+            str(model_pk or ""),
+            normalize_prompt(user_input),
+        )
+    )
+    return f"response_cache:{_thread_digest(thread_id)}:{hashlib.sha256(scope.encode()).hexdigest()[:32]}"
+
+
+async def get_cached_response(key: str) -> str | None:
+    """Return the cached response for ``key``, or ``None`` on miss / Redis failure."""
+    response = _local_get(key)
+    if response is not None:
+        return response
+
+    r = await _get_shared_redis()
+    if r is None:
+        return None
+    try:
+        async with r.pipeline(transaction=False) as pipe:
+            response, ttl = await pipe.get(key).ttl(key).execute()
+    except Exception as e:
+        logger.warning("[RESPONSE_CACHE] Redis read error, falling through: %s", e)
+        return None
+
+    # Promote into the local LRU for the remaining Redis lifetime only
+    if response is not None and ttl and ttl > 0:
+        _local_set(key, response, ttl)
+    return response
+
+
+async def store_cached_response(key: str, response: str) -> None:
+    """Store ``response`` under ``key`` for ``RESPONSE_CACHE_TTL`` seconds."""
+    _local_set(key, response, RESPONSE_CACHE_TTL)
+    r = await _get_shared_redis()
+    if r is None:
+        return
+    # Keys are "response_cache:<thread digest>:<scope digest>"
+    index_key = _thread_index_key(key.split(":", 2)[1])
+    try:
+        async with r.pipeline(transaction=False) as pipe:
+            await (
+                pipe.setex(key, RESPONSE_CACHE_TTL, response)
+                .sadd(index_key, key)
+                .expire(index_key, RESPONSE_CACHE_TTL)
+                .execute()
+            )
+    except Exception as e:
+        logger.warning("[RESPONSE_CACHE] Redis write error: %s", e)
+
+
+async def evict_thread_responses(thread_id: str) -> None:
+    """Drop every cached response of ``thread_id`` from the local LRU and Redis."""
+    thread_digest = _thread_digest(thread_id)
+    prefix = f"response_cache:{thread_digest}:"
+    with _local_cache_lock:
+        for key in [key for key in _local_cache if key.startswith(prefix)]:
+            del _local_cache[key]
+
+    r = await _get_shared_redis()
+    if r is None:
+        return
+    index_key = _thread_index_key(thread_digest)
+    try:
+        keys = await r.smembers(index_key)
+        await r.delete(index_key, *keys)
+    except Exception as e:
+        logger.warning("[RESPONSE_CACHE] Redis evict error: %s", e)
@@ -37,18 +37,22 @@ Note:
 import asyncio
 import logging
 import os
+import time
 from contextlib import asynccontextmanager
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
 
 from langgraph.store.memory import InMemoryStore
 from langgraph.store.postgres.aio import AsyncPostgresStore
 from langgraph.store.redis.aio import AsyncRedisStore
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
 
 from ._utils import (
     get_current_event_loop,
     get_postgres_connection_string,
     get_redis_url,
+    is_connection_alive,
     is_dev_environment,
     log_redis_fallback,
 )
@@ -72,13 +76,16 @@ class StoreMetadata:
         store: The active store instance.
         event_loop: Event loop that created the store, used to detect loop
             replacement and trigger recreation.
-        context_manager: The async context manager returned by ``from_conn_string()``.
-            Must be exited via ``__aexit__`` on cleanup; ``None`` for InMemoryStore.
+        context_manager: The async context manager returned by ``from_conn_string()``
+            (Redis) or the connection pool (Postgres).  Must be exited via
+            ``__aexit__`` on cleanup; ``None`` for InMemoryStore.
+        last_checked: Monotonic time of the last successful liveness probe.
     """
 
     store: StoreType
     event_loop: asyncio.AbstractEventLoop | None
     context_manager: Any | None = None
+    last_checked: float = field(default_factory=time.monotonic)
 
 
 # Global store cache per agent_name
@@ -134,7 +141,7 @@ async def _create_redis_store(redis_url: str, agent_name: str) -> tuple[AsyncRed
     Raises:
         Exception: On connection failure or index-creation error.
     """
-    logger.info(f"[{agent_name}] Creating AsyncRedisStore via from_conn_string")
+    logger.info("[%s] Creating AsyncRedisStore via from_conn_string", agent_name)
 
     # AsyncRedisStore.from_conn_string() already calls store.setup() internally
     # before yielding (see langgraph-redis source: aio.py from_conn_string).
@@ -143,12 +150,12 @@ async def _create_redis_store(redis_url: str, agent_name: str) -> tuple[AsyncRed
     cm = AsyncRedisStore.from_conn_string(redis_url)
     store = await cm.__aenter__()
 
-    logger.info(f"[{agent_name}] ✓ Redis store created successfully")
+    logger.info("[%s] Redis store created successfully", agent_name)
     return store, cm
 
 
 async def _close_store_cm(cm: Any, agent_name: str) -> None:
-    """Exit an async context manager returned by ``from_conn_string()``.
+    """Exit a store's cleanup context manager (``from_conn_string()`` CM or pool).
 
     Args:
         cm: Context manager to exit.
@@ -157,7 +164,7 @@ async def _close_store_cm(cm: Any, agent_name: str) -> None:
     try:
         await cm.__aexit__(None, None, None)
     except Exception as exc:
-        logger.debug(f"[{agent_name}] Error closing store context manager: {exc}")
+        logger.debug("[%s] Error closing store context manager: %s", agent_name, exc)
 
 
 # ---------------------------------------------------------------------------
@@ -166,11 +173,12 @@ async def _close_store_cm(cm: Any, agent_name: str) -> None:
 
 
 async def _create_postgres_store(agent_name: str) -> tuple[AsyncPostgresStore, Any]:
-    """Create and set up a PostgreSQL store.
+    """Create and set up a PostgreSQL store backed by a connection pool.
 
-    ``from_conn_string()`` returns an async context manager.  We enter it with
-    ``__aenter__()`` to obtain the live store object, and return the context
-    manager so the caller can exit it (``__aexit__``) on cleanup.
+    Unlike ``from_conn_string()`` (one connection serialised behind a lock for
+    every concurrent run), the store borrows a pooled connection per operation
+    and returns it straight away.  The pool doubles as the cleanup context
+    manager: exiting it (``__aexit__``) closes every connection.
 
     Connection info is resolved from ``STORE_DB_URL`` (preferred) or falls
     back to Django's ``DATABASES["default"]`` settings — the same convention
@@ -180,20 +188,36 @@ async def _create_postgres_store(agent_name: str) -> tuple[AsyncPostgresStore, A
         agent_name: Agent identifier used in log messages.
 
     Returns:
-        Tuple of (configured AsyncPostgresStore, context manager for cleanup).
+        Tuple of (configured AsyncPostgresStore, pool to exit on cleanup).
 
     Raises:
         Exception: On connection or schema-setup failure.
     """
     conninfo = get_postgres_connection_string("STORE_DB_URL")
-    logger.info(f"[{agent_name}] Creating AsyncPostgresStore")
-
-    cm = AsyncPostgresStore.from_conn_string(conninfo)
-    store = await cm.__aenter__()
-    await store.setup()
+    pool_max_size = int(os.getenv("STORE_POOL_SIZE", "10"))
+    pool_min_size = int(os.getenv("STORE_POOL_MIN_SIZE", "1"))
+    logger.info("[%s] Creating AsyncPostgresStore (pool max=%s, min=%s)", agent_name, pool_max_size, pool_min_size)
+
+    pool: AsyncConnectionPool = AsyncConnectionPool(
+        conninfo=conninfo,
+        max_size=pool_max_size,
+        min_size=pool_min_size,
+        max_idle=float(os.getenv("STORE_POOL_MAX_IDLE", "300")),
+        open=False,
+        # Validate connections on checkout so ones dropped by the server are replaced
+        check=AsyncConnectionPool.check_connection,
+        kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+    )
+    await pool.open()
+    try:
+        store = AsyncPostgresStore(pool)
+        await store.setup()
+    except Exception:
+        await pool.close()
+        raise
 
-    logger.info(f"[{agent_name}] ✓ PostgreSQL store created successfully")
-    return store, cm
+    logger.info("[%s] PostgreSQL store created successfully", agent_name)
+    return store, pool
 
 
 # ---------------------------------------------------------------------------
@@ -216,9 +240,11 @@ def _create_inmemory_store(agent_name: str, reason: str = "No persistent backend
         A fresh ``InMemoryStore`` instance.
     """
     logger.warning(
-        f"[{agent_name}] {reason} — using InMemoryStore. "
+        "[%s] %s — using InMemoryStore. "
         "Long-term memory will NOT persist across restarts. "
-        "Set STORE_BACKEND=postgres for persistence without Redis."
+        "Set STORE_BACKEND=postgres for persistence without Redis.",
+        agent_name,
+        reason,
     )
     return InMemoryStore()
 
@@ -228,6 +254,16 @@ def _create_inmemory_store(agent_name: str, reason: str = "No persistent backend
 # ---------------------------------------------------------------------------
 
 
+def _store_ping(store: StoreType) -> Callable[[], Awaitable[Any]] | None:
+    """Return a cheap round-trip probe for ``store``, or ``None`` if none is needed.
+
+    Postgres stores need no probe: their pool validates connections on checkout.
+    """
+    if isinstance(store, AsyncRedisStore):
+        return store._redis.ping
+    return None
+
+
 async def _build_store(agent_name: str, is_dev: bool) -> tuple[StoreType, Any]:
     """Select and create the appropriate store backend.
 
@@ -256,7 +292,7 @@ async def _build_store(agent_name: str, is_dev: bool) -> tuple[StoreType, Any]:
 
     # ── Explicit memory override (dev/testing only) ──────────────────────────
     if backend == _BACKEND_MEMORY:
-        logger.warning(f"[{agent_name}] STORE_BACKEND=memory explicitly set")
+        logger.warning("[%s] STORE_BACKEND=memory explicitly set", agent_name)
         return _create_inmemory_store(agent_name, reason="STORE_BACKEND=memory explicitly set"), None
 
     # ── Explicit redis override ───────────────────────────────────────────────
@@ -268,16 +304,19 @@ async def _build_store(agent_name: str, is_dev: bool) -> tuple[StoreType, Any]:
 
     # ── Explicit postgres override ────────────────────────────────────────────
     if backend == _BACKEND_POSTGRES:
-        logger.info(f"[{agent_name}] STORE_BACKEND=postgres")
+        logger.info("[%s] STORE_BACKEND=postgres", agent_name)
         return await _create_postgres_store(agent_name)
 
     # ── Auto mode: Postgres first, Redis fallback, InMemory last resort ───────
-    logger.info(f"[{agent_name}] Auto mode — trying AsyncPostgresStore first")
+    logger.info("[%s] Auto mode — trying AsyncPostgresStore first", agent_name)
     try:
         return await _create_postgres_store(agent_name)
     except Exception as pg_err:
         logger.warning(
-            f"[{agent_name}] PostgreSQL store unavailable ({type(pg_err).__name__}: {pg_err}) — trying Redis"
+            "[%s] PostgreSQL store unavailable (%s: %s) — trying Redis",
+            agent_name,
+            type(pg_err).__name__,
+            pg_err,
         )
 
     redis_url = _get_redis_url()
@@ -310,8 +349,13 @@ async def _get_or_create_store(agent_name: str, is_dev: bool) -> StoreType:
         # *identity* would force a recreation on every request because Django
         # allocates a new loop object per async view — causing setup() to run
         # and "Index already exists" to be logged on every call.
-        if stored_loop is not None and stored_loop.is_closed():
-            logger.debug(f"[{agent_name}] Stored event loop is closed — recreating store")
+        loop_closed = stored_loop is not None and stored_loop.is_closed()
+        if loop_closed:
+            logger.debug("[%s] Stored event loop is closed — recreating store", agent_name)
+        ping = None if loop_closed else _store_ping(metadata.store)
+        if loop_closed or (
+            ping is not None and not await is_connection_alive(metadata, ping, agent_name, "store connection")
+        ):
             if metadata.context_manager is not None:
                 await _close_store_cm(metadata.context_manager, agent_name)
             del _stores[agent_name]
@@ -354,6 +398,15 @@ async def get_store(agent_name: str = "deep_agent") -> StoreType:
     return await _get_or_create_store(agent_name, is_dev=is_dev_environment())
 
 
+def clear_store_cache() -> None:
+    """Forget every cached store without closing it.
+
+    Used to recover when cached connections are bound to a dead event loop and
+    can no longer be closed cleanly; the next request recreates them.
+    """
+    _stores.clear()
+
+
 async def close_all_stores() -> None:
     """Close all cached stores and clear the global store cache.
 
@@ -366,7 +419,7 @@ async def close_all_stores() -> None:
     for agent_name, metadata in list(_stores.items()):
         if metadata.context_manager is not None:
             backend = type(metadata.store).__name__
-            logger.info(f"[{agent_name}] Closing {backend} store")
+            logger.info("[%s] Closing %s store", agent_name, backend)
             await _close_store_cm(metadata.context_manager, agent_name)
         # InMemoryStore (context_manager is None) has no cleanup needed
 
@@ -399,6 +452,6 @@ async def managed_store(agent_name: str = "deep_agent"):
             metadata = _stores[agent_name]
             if metadata.context_manager is not None:
                 backend = type(metadata.store).__name__
-                logger.info(f"[{agent_name}] Closing managed {backend} store")
+                logger.info("[%s] Closing managed %s store", agent_name, backend)
                 await _close_store_cm(metadata.context_manager, agent_name)
             del _stores[agent_name]
@@ -5,11 +5,55 @@ It handles provider selection, model lookup, API key retrieval, and model instan
 """
 
 import logging
+import os
+import threading
+import time
 
 from asgiref.sync import sync_to_async
 
 logger = logging.getLogger(__name__)
 
+# The default model row is read on every agent request but almost never changes.
+# Cached for DEFAULT_MODEL_CACHE_TTL seconds and dropped by ai_ops.signals on edits.
+DEFAULT_MODEL_CACHE_TTL: int = int(os.getenv("DEFAULT_MODEL_CACHE_TTL", "60"))
+
+_default_model_cache: tuple[float, object] | None = None  # (monotonic expiry, LLMModel)
+_default_model_lock = threading.Lock()
+
+
+async def get_default_model_cached():
+    """Return the default LLMModel, served from a short-lived in-process cache.
+
+    The instance (with its provider and system prompt preloaded) is shared
+    between requests, so callers must treat it as read-only.
+
+    Returns:
+        LLMModel: The default model instance.
+
+    Raises:
+        LLMModel.DoesNotExist: If no models exist in the database.
+    """
+    global _default_model_cache
+    from ai_ops.models import LLMModel
+
+    with _default_model_lock:
+        cached = _default_model_cache
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    llm_model = await LLMModel.aget_default_model()
+    if DEFAULT_MODEL_CACHE_TTL > 0:
+        with _default_model_lock:
+            _default_model_cache = (time.monotonic() + DEFAULT_MODEL_CACHE_TTL, llm_model)
+    return llm_model
+
+
+def clear_default_model_cache() -> None:
+    """Drop the cached default model so the next lookup hits the database."""
+    global _default_model_cache
+    with _default_model_lock:
+        _default_model_cache = None
+
 
 async def get_llm_model_async(
     model_name: str | None = None,
@@ -49,7 +93,7 @@ async def get_llm_model_async(
         if model_name:
             llm_model = await sync_to_async(LLMModel.objects.select_related("llm_provider").get)(name=model_name)
         else:
-            llm_model = await sync_to_async(LLMModel.get_default_model)()
+            llm_model = await get_default_model_cached()
 
         logger.debug(f"Retrieved LLMModel: {llm_model.name}, provider: {llm_model.llm_provider.name}")
 
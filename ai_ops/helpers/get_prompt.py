@@ -1,11 +1,126 @@
 """Helper functions for loading system prompts."""
 
+import hashlib
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Rendered prompts keyed by (llm_model pk, tool fingerprint). The short TTL keeps
+# {current_date} fresh; model/prompt/MCP server edits clear the cache via signals.
+# Every tool catalog change yields a new key, so the cache is a bounded LRU.
+PROMPT_CACHE_TTL: int = int(os.getenv("PROMPT_CACHE_TTL", "60"))
+PROMPT_CACHE_SIZE: int = int(os.getenv("PROMPT_CACHE_SIZE", "64"))
+_prompt_cache: "OrderedDict[tuple, tuple[float, str]]" = OrderedDict()
+_prompt_cache_lock = threading.Lock()
+
+
+def _tool_name(tool) -> str:
+    """Return a tool's name whether it is a LangChain tool or a plain dict."""
+    if isinstance(tool, dict):
+        return str(tool.get("name", tool))
+    return str(getattr(tool, "name", tool))
+
+
+def _tool_description(tool) -> str:
+    """Return a tool's description whether it is a LangChain tool or a plain dict."""
+    if isinstance(tool, dict):
+        return str(tool.get("description") or "")
+    return str(getattr(tool, "description", None) or "")
+
+
+def get_tools_fingerprint(tools) -> bytes:
+    """Return a short, order-independent digest of a tool list.
+
+    Covers each tool's name and description, which is everything the prompt
+    templates render, so any change to the tool catalog yields a new digest.
+
+    Args:
+        tools: LangChain tools or tool dicts.
+
+    Returns:
+        bytes: 16-byte blake2b digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for name, description in sorted((_tool_name(t), _tool_description(t)) for t in tools or []):
+        digest.update(name.encode())
+        digest.update(b"\x1f")
+        digest.update(description.encode())
+        digest.update(b"\x1e")
+    return digest.digest()
+
+
+def _prompt_cache_key(llm_model, tools) -> tuple:
+    """Build the prompt cache key from the model pk and the tool fingerprint."""
+    return (llm_model.pk if llm_model else None, get_tools_fingerprint(tools))
+
+
+def _prompt_cache_get(key: tuple) -> str | None:
+    """Return a live cached prompt for ``key``, evicting it if expired."""
+    with _prompt_cache_lock:
+        cached = _prompt_cache.get(key)
+        if cached is None:
+            return None
+        if cached[0] <= time.monotonic():
+            del _prompt_cache[key]
+            return None
+        _prompt_cache.move_to_end(key)
+        return cached[1]
+
+
+def _prompt_cache_set(key: tuple, prompt: str) -> None:
+    """Cache ``prompt`` under ``key`` for ``PROMPT_CACHE_TTL`` seconds, evicting the least recently used."""
+    if PROMPT_CACHE_TTL <= 0 or PROMPT_CACHE_SIZE <= 0:
+        return
+    with _prompt_cache_lock:
+        _prompt_cache[key] = (time.monotonic() + PROMPT_CACHE_TTL, prompt)
+        _prompt_cache.move_to_end(key)
+        while len(_prompt_cache) > PROMPT_CACHE_SIZE:
+            _prompt_cache.popitem(last=False)
+
+
+def get_cached_active_prompt(llm_model, tools=None) -> str:
+    """Return :func:`get_active_prompt`, cached for ``PROMPT_CACHE_TTL`` seconds.
+
+    The rendered prompt only depends on the model's prompt assignment and the
+    available tools (see :func:`get_tools_fingerprint`), so repeat agent builds reuse it instead of
+    re-querying SystemPrompt and re-rendering the template.
+
+    Args:
+        llm_model: The LLMModel instance to get the prompt for.
+        tools: Optional list of tools available to the model.
+
+    Returns:
+        str: The rendered system prompt content.
+    """
+    key = _prompt_cache_key(llm_model, tools)
+    prompt = _prompt_cache_get(key)
+    if prompt is None:
+        prompt = get_active_prompt(llm_model, tools=tools)
+        _prompt_cache_set(key, prompt)
+    return prompt
+
+
+async def aget_cached_active_prompt(llm_model, tools=None) -> str:
+    """Async version of :func:`get_cached_active_prompt` backed by :func:`aget_active_prompt`."""
+    key = _prompt_cache_key(llm_model, tools)
+    prompt = _prompt_cache_get(key)
+    if prompt is None:
+        prompt = await aget_active_prompt(llm_model, tools=tools)
+        _prompt_cache_set(key, prompt)
+    return prompt
+
+
+def clear_prompt_cache() -> None:
+    """Drop all cached rendered prompts."""
+    with _prompt_cache_lock:
+        _prompt_cache.clear()
+
 
 def get_active_prompt(llm_model, tools=None) -> str:
     """Load the active system prompt for an LLM model.
@@ -27,35 +142,94 @@ def get_active_prompt(llm_model, tools=None) -> str:
     """
     from ai_ops.models import SystemPrompt
 
-    if tools is None:
-        tools = []
-
-    prompt_obj = None
     model_name = llm_model.name if llm_model else "Unknown"
-
     logger.debug(f"Loading system prompt for model: {model_name}")
 
-    # 1. Check if model has an assigned prompt with Approved status
-    if llm_model and hasattr(llm_model, "system_prompt") and llm_model.system_prompt:
-        prompt_obj = llm_model.system_prompt
-        logger.debug(
-            f"Found prompt '{prompt_obj.name}' with status '{prompt_obj.status.name if prompt_obj.status else 'None'}'"
+    # 1. Model's assigned prompt, if Approved
+    prompt_obj = _approved_model_prompt(getattr(llm_model, "system_prompt", None), model_name)
+
+    # 2. If no model-specific prompt, try to find a global approved prompt
+    if not prompt_obj:
+        prompt_obj = (
+            SystemPrompt.objects.filter(status__name="Approved", is_file_based=True).order_by("-version").first()
         )
-        if prompt_obj.status and prompt_obj.status.name != "Approved":
-            logger.debug(
-                f"System prompt '{prompt_obj.name}' has status '{prompt_obj.status.name}', not 'Approved'. Falling back."
+        logger.debug(f"Using global fallback prompt: {prompt_obj.name if prompt_obj else 'None'}")
+
+    return _render_active_prompt(prompt_obj, model_name, tools=tools)
+
+
+async def aget_active_prompt(llm_model, tools=None) -> str:
+    """Async version of :func:`get_active_prompt` using Django's native async ORM.
+
+    Only the SystemPrompt lookups touch the database; rendering is plain CPU
+    work and runs inline, so no thread-pool hop is needed.
+
+    Args:
+        llm_model: The LLMModel instance to get the prompt for.
+        tools: Optional list of tools available to the model.
+
+    Returns:
+        str: The rendered system prompt content.
+    """
+    from ai_ops.models import SystemPrompt
+
+    model_name = llm_model.name if llm_model else "Unknown"
+    logger.debug(f"Loading system prompt for model: {model_name}")
+
+    # 1. Model's assigned prompt — reuse it if select_related already loaded it
+    assigned_prompt = None
+    if llm_model and getattr(llm_model, "system_prompt_id", None):
+        if _system_prompt_is_loaded(llm_model):
+            assigned_prompt = llm_model.system_prompt
+        else:
+            assigned_prompt = (
+                await SystemPrompt.objects.select_related("status").filter(pk=llm_model.system_prompt_id).afirst()
             )
-            prompt_obj = None
-    else:
-        logger.debug(f"No system_prompt assigned to model '{model_name}'")
+    prompt_obj = _approved_model_prompt(assigned_prompt, model_name)
 
     # 2. If no model-specific prompt, try to find a global approved prompt
     if not prompt_obj:
         prompt_obj = (
-            SystemPrompt.objects.filter(status__name="Approved", is_file_based=True).order_by("-version").first()
+            await SystemPrompt.objects.select_related("status")
+            .filter(status__name="Approved", is_file_based=True)
+            .order_by("-version")
+            .afirst()
         )
         logger.debug(f"Using global fallback prompt: {prompt_obj.name if prompt_obj else 'None'}")
 
+    return _render_active_prompt(prompt_obj, model_name, tools=tools)
+
+
+def _system_prompt_is_loaded(llm_model) -> bool:
+    """Return ``True`` if ``llm_model.system_prompt`` (and its status) were select_related."""
+    if not llm_model._meta.get_field("system_prompt").is_cached(llm_model):
+        return False
+    prompt_obj = llm_model.system_prompt
+    return prompt_obj is not None and prompt_obj._meta.get_field("status").is_cached(prompt_obj)
+
+
+def _approved_model_prompt(prompt_obj, model_name: str):
+    """Return ``prompt_obj`` if it is Approved, otherwise ``None``."""
+    if not prompt_obj:
+        logger.debug(f"No system_prompt assigned to model '{model_name}'")
+        return None
+
+    logger.debug(
+        f"Found prompt '{prompt_obj.name}' with status '{prompt_obj.status.name if prompt_obj.status else 'None'}'"
+    )
+    if prompt_obj.status and prompt_obj.status.name != "Approved":
+        logger.debug(
+            f"System prompt '{prompt_obj.name}' has status '{prompt_obj.status.name}', not 'Approved'. Falling back."
+        )
+        return None
+    return prompt_obj
+
+
+def _render_active_prompt(prompt_obj, model_name: str, tools=None) -> str:
+    """Render the selected prompt, or the code fallback when none was found."""
+    if tools is None:
+        tools = []
+
     # 3. If we have a valid prompt object, load it
     if prompt_obj:
         logger.info(f"Using system prompt: {prompt_obj.name} (model={model_name})")
@@ -7,9 +7,13 @@ Environment Variables:
     AI_OPS_JSON_LOGGING: Set to 'false' for text logging (default: 'true')
 """
 
+import asyncio
 import logging
+import uuid
+from contextlib import aclosing, contextmanager
 from contextvars import ContextVar
 from datetime import datetime
+from typing import AsyncIterator, Callable, Iterator, TypeVar
 
 # Context variable for async-safe correlation ID tracking
 correlation_id_var: ContextVar[str] = ContextVar("correlation_id", default="")
@@ -20,6 +24,11 @@ user_var: ContextVar[str] = ContextVar("user", default="")
 # Module-level flag to track if logging has been configured
 _logging_configured = False
 
+T = TypeVar("T")
+
+# Marks the end of a stream handed over by stream_in_request_context
+_STREAM_END = object()
+
 
 class CorrelationIdFilter(logging.Filter):
     """Logging filter that adds correlation_id and user to all log records."""
@@ -115,22 +124,18 @@ def get_correlation_id() -> str:
     """Get the current correlation ID; if none is set, generate a new one and store it in the context."""
     cid = correlation_id_var.get()
     if not cid:
-        import uuid
-
         cid = str(uuid.uuid4())
         correlation_id_var.set(cid)
     return cid
 
 
 def set_correlation_id(cid: str) -> None:
-    """Get the current correlation ID; if none is set, generate a new one and store it in the context."""
+    """Set the correlation ID for the current async context."""
     correlation_id_var.set(cid)
 
 
 def generate_correlation_id() -> str:
     """Generate a new correlation ID and set it in context."""
-    import uuid
-
     cid = str(uuid.uuid4())
     correlation_id_var.set(cid)
     return cid
@@ -148,3 +153,72 @@ def get_user() -> str:
 def set_user(username: str) -> None:
     """Set the user for the current async context."""
     user_var.set(username)
+
+
+@contextmanager
+def bind_request_context(username: str | None = None) -> Iterator[str]:
+    """Bind a fresh correlation ID and user for the duration of a request.
+
+    Both values live in ContextVars, so concurrent requests on the same event
+    loop never see each other's values.  They are reset on exit: callers such
+    as ``async_to_sync`` copy context changes back into the calling worker
+    thread, and without the reset the next request served by that thread
+    would log under the previous request's user and correlation ID.
+
+    Args:
+        username: User to tag log records with (empty if anonymous).
+
+    Yields:
+        str: The new correlation ID.
+    """
+    cid = str(uuid.uuid4())
+    cid_token = correlation_id_var.set(cid)
+    user_token = user_var.set(username or "")
+    try:
+        yield cid
+    finally:
+        user_var.reset(user_token)
+        correlation_id_var.reset(cid_token)
+
+
+async def stream_in_request_context(
+    username: str | None,
+    producer: Callable[[str], AsyncIterator[T]],
+) -> AsyncIterator[T]:
+    """Yield the items of a stream that runs under its own bound request context.
+
+    An async generator cannot hold :func:`bind_request_context` across
+    ``yield`` statements: the values would stay set in the consumer's context
+    between items, and resetting them raises ``ValueError`` when the generator is
+    closed from another context (``aclose`` from another task, or finalisation
+    at loop shutdown).  The producer therefore runs in a task of its own, which
+    works on a copy of the context, and hands its items over through a queue.
+    Closing the stream early cancels the producer.
+
+    Args:
+        username: User to tag log records with (empty if anonymous).
+        producer: Called with the new correlation ID; returns the items to stream.
+
+    Yields:
+        The producer's items. An exception it raises is re-raised after them.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce() -> None:
+        try:
+            with bind_request_context(username) as correlation_id:
+                async with aclosing(producer(correlation_id)) as items:
+                    async for item in items:
+                        queue.put_nowait(item)
+        finally:
+            queue.put_nowait(_STREAM_END)
+
+    task = asyncio.create_task(produce())
+    try:
+        while (item := await queue.get()) is not _STREAM_END:
+            yield item
+        await task
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.wait({task})
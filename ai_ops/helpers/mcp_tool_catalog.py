@@ -0,0 +1,134 @@
+"""On-disk catalog of discovered MCP tool definitions.
+
+Tool discovery contacts every MCP server, which dominates cold-start time for
+the multi-MCP agent. The catalog stores the tool definitions (name,
+description, input schema) per server in a JSON file keyed by a digest of the
+healthy server set, so a restarted worker can rebuild its tools without any
+network round trip.
+
+Editing, adding or removing a server changes the digest, so stale catalogs are
+never read; only the most recent catalog file is kept.
+
+Configuration (app settings):
+- mcp_tool_catalog_dir: Directory for catalog files (default: "" - disabled)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+from mcp.types import Tool as MCPTool
+from nautobot.apps.config import get_app_settings_or_config
+
+logger = logging.getLogger(__name__)
+
+_CATALOG_PREFIX = "mcp_tools_"
+
+
+def _get_catalog_dir() -> Path | None:
+    """Return the configured catalog directory, or ``None`` when the catalog is disabled."""
+    catalog_dir = get_app_settings_or_config("ai_ops", "mcp_tool_catalog_dir")
+    return Path(catalog_dir).expanduser() if catalog_dir else None
+
+
+def get_catalog_key(servers) -> str:
+    """Return a digest identifying a set of MCP servers and their last edit.
+
+    Args:
+        servers: MCPServer instances.
+
+    Returns:
+        str: 32-character hex digest, independent of server order.
+    """
+    entries = sorted(
+        [
+            str(server.pk),
+            server.url,
+            server.mcp_endpoint,
+            server.last_updated.isoformat() if server.last_updated else "",
+        ]
+        for server in servers
+    )
+    return hashlib.sha256(json.dumps(entries).encode()).hexdigest()[:32]
+
+
+def _tool_definition(tool) -> dict:
+    """Return the MCP tool definition a LangChain MCP tool was built from."""
+    schema = tool.args_schema
+    if not isinstance(schema, dict):
+        schema = tool.get_input_schema().model_json_schema()
+    return {"name": tool.name, "description": tool.description, "inputSchema": schema}
+
+
+def load_tool_catalog(key: str, connections: dict[str, dict]) -> list | None:
+    """Rebuild LangChain tools from the catalog stored under ``key``.
+
+    Args:
+        key: Catalog key from :func:`get_catalog_key`.
+        connections: MultiServerMCPClient connection configs by server name.
+
+    Returns:
+        list | None: The tools, or ``None`` when the catalog is disabled, missing
+        or does not cover every server in ``connections``.
+    """
+    catalog_dir = _get_catalog_dir()
+    if catalog_dir is None:
+        return None
+    try:
+        catalog = json.loads((catalog_dir / f"{_CATALOG_PREFIX}{key}.json").read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("[mcp_catalog] ignoring unreadable tool catalog: %s", e)
+        return None
+
+    if set(catalog) != set(connections):
+        return None
+    try:
+        return [
+            convert_mcp_tool_to_langchain_tool(None, MCPTool.model_validate(definition), connection=connections[name])
+            for name, definitions in catalog.items()
+            for definition in definitions
+        ]
+    except Exception as e:
+        logger.warning("[mcp_catalog] ignoring invalid tool catalog: %s", e)
+        return None
+
+
+def save_tool_catalog(key: str, tools_by_server: dict[str, list]) -> None:
+    """Write the tools discovered per server as the catalog for ``key``.
+
+    The file is written atomically and replaces any older catalog files.
+    """
+    catalog_dir = _get_catalog_dir()
+    if catalog_dir is None:
+        return
+    catalog = {name: [_tool_definition(tool) for tool in tools] for name, tools in tools_by_server.items()}
+    path = catalog_dir / f"{_CATALOG_PREFIX}{key}.json"
+    try:
+        catalog_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=catalog_dir, prefix=".tmp_", suffix=".json")
+        with os.fdopen(fd, "w") as tmp_file:
+            json.dump(catalog, tmp_file)
+        os.replace(tmp_path, path)
+        for stale in catalog_dir.glob(f"{_CATALOG_PREFIX}*.json"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning("[mcp_catalog] failed to write tool catalog: %s", e)
+
+
+def purge_tool_catalog() -> None:
+    """Delete every stored catalog so the next cold start rediscovers tools."""
+    catalog_dir = _get_catalog_dir()
+    if catalog_dir is None:
+        return
+    for path in catalog_dir.glob(f"{_CATALOG_PREFIX}*.json"):
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning("[mcp_catalog] failed to delete %s: %s", path, e)
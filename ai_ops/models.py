@@ -6,6 +6,7 @@
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils.functional import cached_property
 
 # Nautobot imports
 from nautobot.apps.constants import CHARFIELD_MAX_LENGTH
@@ -353,6 +354,27 @@ class LLMModel(PrimaryModel):  # pylint: disable=too-many-ancestors
             "No LLMModel instances exist in the database. Please create at least one model before attempting to retrieve the default."
         )
 
+    @classmethod
+    async def aget_default_model(cls) -> "LLMModel":
+        """Async version of :meth:`get_default_model` using Django's native async ORM.
+
+        Returns:
+            LLMModel: The default model instance.
+
+        Raises:
+            LLMModel.DoesNotExist: If no models exist in the database.
+        """
+        queryset = cls.objects.select_related("llm_provider", "system_prompt", "system_prompt__status")
+        default_model = await queryset.filter(is_default=True).afirst()
+        if default_model:
+            return default_model
+        first_model = await queryset.afirst()
+        if first_model:
+            return first_model
+        raise cls.DoesNotExist(
+            "No LLMModel instances exist in the database. Please create at least one model before attempting to retrieve the default."
+        )
+
     @classmethod
     def get_all_models_summary(cls) -> list[dict]:
         """Get a summary of all available models.
@@ -597,6 +619,11 @@ class MCPServer(PrimaryModel):  # pylint: disable=too-many-ancestors
         verbose_name = "MCP Server"
         verbose_name_plural = "MCP Servers"
 
+    @cached_property
+    def full_mcp_url(self) -> str:
+        """Full MCP URL: base URL (without trailing slash) joined with the MCP endpoint."""
+        return f"{self.url.rstrip('/')}{self.mcp_endpoint}"
+
     def clean(self):
         """Validate MCPServer instance."""
         super().clean()
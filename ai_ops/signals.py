@@ -9,6 +9,78 @@ and never clobbers data that users have intentionally modified:
 - ``0008_default_scheduled_jobs``      — MCP Server Health Check, Hourly Checkpoint
                                          Cleanup, and Chat Session Cleanup scheduled jobs.
 
-This file is intentionally empty of business logic.  It is kept so that
-``__init__.py`` import paths remain stable.
+The only handlers here invalidate in-process caches when the models they were
+built from change.  Signals only fire in the process that saved the model;
+other workers pick the change up when their cached entries expire.
 """
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from ai_ops.helpers.get_llm_model import clear_default_model_cache
+from ai_ops.helpers.get_prompt import clear_prompt_cache
+from ai_ops.models import LLMMiddleware, LLMModel, LLMProvider, MCPServer, SystemPrompt
+
+# MCPServer fields the agents' MCP connections are built from. Saves that change
+# none of them (e.g. a description edit) leave compiled graphs and prompts alone.
+MCP_CONNECTION_FIELDS = ("url", "mcp_endpoint", "protocol", "status")
+
+
+@receiver([post_save, post_delete], sender=LLMModel)
+@receiver([post_save, post_delete], sender=SystemPrompt)
+@receiver(post_delete, sender=MCPServer)
+def invalidate_prompt_cache(sender, **kwargs):
+    """Drop cached rendered prompts when a model, system prompt or MCP server changes."""
+    clear_prompt_cache()
+
+
+@receiver([post_save, post_delete], sender=LLMModel)
+@receiver([post_save, post_delete], sender=LLMProvider)
+@receiver([post_save, post_delete], sender=SystemPrompt)
+def invalidate_default_model_cache(sender, **kwargs):
+    """Drop the cached default model when it, its provider or its system prompt may have changed."""
+    clear_default_model_cache()
+
+
+@receiver([post_save, post_delete], sender=LLMModel)
+@receiver([post_save, post_delete], sender=LLMProvider)
+@receiver([post_save, post_delete], sender=LLMMiddleware)
+@receiver([post_save, post_delete], sender=SystemPrompt)
+@receiver(post_delete, sender=MCPServer)
+def invalidate_agent_graphs(sender, **kwargs):
+    """Drop compiled agent graphs when any model they are built from changes."""
+    # Imported lazily so app startup doesn't pull in the agent framework
+    from ai_ops.agents.deep_mcp_agent import invalidate_graph_cache
+    from ai_ops.agents.multi_mcp_agent import clear_agent_cache
+
+    invalidate_graph_cache()
+    clear_agent_cache()
+
+
+@receiver(pre_save, sender=MCPServer)
+def detect_mcp_connection_change(sender, instance, update_fields=None, **kwargs):
+    """Record on ``instance`` whether this save changes one of ``MCP_CONNECTION_FIELDS``."""
+    fields = [
+        field
+        for field in (sender._meta.get_field(name) for name in MCP_CONNECTION_FIELDS)
+        if update_fields is None or field.name in update_fields or field.attname in update_fields
+    ]
+    if not fields:
+        instance._mcp_connection_changed = False
+        return
+    previous = sender.objects.filter(pk=instance.pk).values(*(field.attname for field in fields)).first()
+    instance._mcp_connection_changed = previous is None or any(
+        previous[field.attname] != getattr(instance, field.attname) for field in fields
+    )
+
+
+@receiver(post_save, sender=MCPServer)
+def invalidate_on_mcp_connection_change(sender, instance, **kwargs):
+    """Drop rendered prompts and compiled agent graphs when a save changed how an MCP server is reached.
+
+    Routine saves that leave the connection fields untouched, such as a health
+    check confirming the current status, keep the caches.
+    """
+    if getattr(instance, "_mcp_connection_changed", True):
+        invalidate_prompt_cache(sender)
+        invalidate_agent_graphs(sender)
@@ -127,7 +127,7 @@ class CheckpointerTestCase(TestCase):
 
     def test_cleanup_expired_checkpoints_clears_middleware_cache(self):
         """Test that cleanup_expired_checkpoints clears middleware cache when deleting checkpoints."""
-        from datetime import datetime, timedelta
+        import time
 
         # Setup checkpointer
         from langgraph.checkpoint.memory import MemorySaver
@@ -142,8 +142,8 @@ class CheckpointerTestCase(TestCase):
         }
 
         # Set timestamps - one old, one new
-        old_time = datetime.now() - timedelta(minutes=10)
-        new_time = datetime.now()
+        old_time = time.monotonic() - 10 * 60
+        new_time = time.monotonic()
         checkpoint_module._checkpoint_timestamps = {
             ("old_thread",): old_time,
             ("new_thread",): new_time,
@@ -157,6 +157,298 @@ class CheckpointerTestCase(TestCase):
         self.assertEqual(result["deleted_count"], 1)
 
 
+class LoggingContextTestCase(TestCase):
+    """Test cases for request-scoped logging context."""
+
+    def test_bind_request_context_resets_on_exit(self):
+        """Test bind_request_context restores the previous user and correlation ID."""
+        from ai_ops.helpers.logging_config import (
+            bind_request_context,
+            correlation_id_var,
+            get_user,
+            set_correlation_id,
+            set_user,
+        )
+
+        set_user("outer-user")
+        set_correlation_id("outer-id")
+
+        with bind_request_context("inner-user") as correlation_id:
+            self.assertEqual(get_user(), "inner-user")
+            self.assertEqual(correlation_id_var.get(), correlation_id)
+            self.assertNotEqual(correlation_id, "outer-id")
+
+        self.assertEqual(get_user(), "outer-user")
+        self.assertEqual(correlation_id_var.get(), "outer-id")
+
+    def test_stream_in_request_context_closed_early(self):
+        """Test a stream's request context never reaches the consumer, even when closed from another task."""
+        import asyncio
+
+        from asgiref.sync import async_to_sync
+
+        from ai_ops.helpers.logging_config import correlation_id_var, get_user, set_user, stream_in_request_context
+
+        seen = []
+
+        async def producer(correlation_id):
+            try:
+                for chunk in ("a", "b", "c"):
+                    seen.append((get_user(), correlation_id_var.get() == correlation_id))
+                    yield chunk
+                    await asyncio.sleep(0)
+            finally:
+                seen.append("closed")
+
+        async def consume_first_chunk():
+            set_user("outer-user")
+            stream = stream_in_request_context("inner-user", producer)
+            first = await stream.__anext__()
+            user_between_chunks = get_user()
+            await asyncio.create_task(stream.aclose())
+            return first, user_between_chunks, get_user()
+
+        self.assertEqual(async_to_sync(consume_first_chunk)(), ("a", "outer-user", "outer-user"))
+        self.assertEqual(seen[0], ("inner-user", True))
+        self.assertEqual(seen[-1], "closed")
+
+
+class SubagentLoaderTestCase(TestCase):
+    """Test cases for subagent spec parsing and tool binding."""
+
+    def test_build_subagents_binds_tools_per_call(self):
+        """Test build_subagents reuses parsed specs and only binds the supplied tools."""
+        from ai_ops.helpers.deep_agent.agents_loader import build_subagents
+
+        specs = {
+            "researcher": {"description": "Looks things up", "tools": ["mcp_tools", "missing"]},
+            "writer": {"description": "Writes", "model": "gpt-4o"},
+        }
+        tool_a, tool_b = MagicMock(), MagicMock()
+
+        agents = build_subagents(specs, tools={"mcp_tools": [tool_a, tool_b]})
+
+        self.assertEqual([a["name"] for a in agents], ["researcher", "writer"])
+        self.assertEqual(agents[0]["tools"], [tool_a, tool_b])
+        self.assertEqual(agents[1]["model"], "gpt-4o")
+        self.assertNotIn("tools", agents[1])
+        self.assertEqual(build_subagents(specs, tools={"mcp_tools": []})[0]["tools"], [])
+
+
+class ResponseCacheTestCase(TestCase):
+    """Test cases for the deep agent response cache."""
+
+    def test_response_cache_key_scoped_to_conversation_state(self):
+        """Test keys change with the checkpoint and model and never contain the raw token."""
+        from ai_ops.helpers.deep_agent.response_cache import build_response_cache_key
+
+        key = build_response_cache_key("List sites", "thread-1", checkpoint_id="cp-1", token_scope="abc", model_pk=1)
+        self.assertEqual(
+            key,
+            build_response_cache_key("list sites?", "thread-1", checkpoint_id="cp-1", token_scope="abc", model_pk=1),
+        )
+        self.assertNotEqual(
+            key,
+            build_response_cache_key("List sites", "thread-1", checkpoint_id="cp-2", token_scope="abc", model_pk=1),
+        )
+        self.assertNotEqual(
+            key,
+            build_response_cache_key("List sites", "thread-1", checkpoint_id="cp-1", token_scope="abc", model_pk=2),
+        )
+
+    def test_evict_thread_responses_drops_local_entries(self):
+        """Test clearing a thread evicts only that thread's cached answers."""
+        from asgiref.sync import async_to_sync
+
+        from ai_ops.helpers.deep_agent import response_cache
+
+        kept = response_cache.build_response_cache_key("hi", "thread-2")
+        evicted = response_cache.build_response_cache_key("hi", "thread-1")
+        response_cache._local_set(kept, "kept", 60)
+        response_cache._local_set(evicted, "evicted", 60)
+
+        with patch("ai_ops.helpers.deep_agent.response_cache._get_shared_redis", AsyncMock(return_value=None)):
+            async_to_sync(response_cache.evict_thread_responses)("thread-1")
+
+        self.assertIsNone(response_cache._local_get(evicted))
+        self.assertEqual(response_cache._local_get(kept), "kept")
+        response_cache.clear_local_response_cache()
+
+    @patch("ai_ops.helpers.deep_agent.response_cache._get_shared_redis", new_callable=AsyncMock, return_value=None)
+    @patch("ai_ops.agents.deep_mcp_agent.get_default_model_cached", new_callable=AsyncMock)
+    @patch("ai_ops.agents.deep_mcp_agent.get_deep_agent", new_callable=AsyncMock)
+    @patch("ai_ops.agents.deep_mcp_agent.RESPONSE_CACHE_ENABLED", True)
+    def test_repeated_prompt_hits_response_cache(self, mock_get_deep_agent, mock_get_default_model, mock_redis):
+        """Test a prompt repeated right after it was answered is served without running the agent."""
+        from types import SimpleNamespace
+
+        from asgiref.sync import async_to_sync
+        from langchain_core.messages import AIMessage
+
+        from ai_ops.agents import deep_mcp_agent
+        from ai_ops.helpers.deep_agent import response_cache
+
+        class FakeGraph:
+            """Graph stand-in that moves the thread to a new checkpoint on every run."""
+
+            def __init__(self):
+                self.runs = 0
+                self.checkpointer = SimpleNamespace(aget_tuple=AsyncMock(side_effect=self._latest_checkpoint))
+
+            async def _latest_checkpoint(self, config):
+                return SimpleNamespace(checkpoint={"id": f"cp-{self.runs}"}) if self.runs else None
+
+            async def astream(self, inputs, config, stream_mode):
+                self.runs += 1
+                yield {"messages": [*inputs["messages"], AIMessage(content=f"answer {self.runs}")]}
+
+        graph = FakeGraph()
+        mock_get_deep_agent.return_value = graph
+        mock_get_default_model.return_value = MagicMock(pk=1)
+        response_cache.clear_local_response_cache()
+        process_message = async_to_sync(deep_mcp_agent.process_message)
+
+        self.assertEqual(process_message("List sites", "thread-1"), "answer 1")
+        self.assertEqual(process_message("list sites?", "thread-1"), "answer 1")
+        self.assertEqual(graph.runs, 1)
+
+        self.assertEqual(process_message("List devices", "thread-1"), "answer 2")
+        self.assertEqual(process_message("List sites", "thread-1"), "answer 3")
+        self.assertEqual(graph.runs, 3)
+        response_cache.clear_local_response_cache()
+
+
+class DeepAgentGraphCacheTestCase(TestCase):
+    """Test cases for the deep agent compiled graph cache."""
+
+    def setUp(self):
+        from ai_ops.agents import deep_mcp_agent
+
+        deep_mcp_agent.clear_graph_cache()
+        self.addCleanup(deep_mcp_agent.clear_graph_cache)
+
+    @staticmethod
+    def _fake_graph(checkpointer, store):
+        """Return a stand-in for a compiled graph with Pregel's copy(update=...)."""
+
+        class FakeGraph:
+            def __init__(self, checkpointer, store):
+                self.checkpointer, self.store = checkpointer, store
+
+            def copy(self, update):
+                return FakeGraph(update["checkpointer"], update["store"])
+
+        return FakeGraph(checkpointer, store)
+
+    @patch("ai_ops.agents.deep_mcp_agent.build_deep_agent", new_callable=AsyncMock)
+    @patch("ai_ops.agents.deep_mcp_agent.get_store", new_callable=AsyncMock)
+    @patch("ai_ops.agents.deep_mcp_agent.get_checkpointer", new_callable=AsyncMock)
+    def test_cached_graph_rebound_when_checkpointer_replaced(self, mock_get_checkpointer, mock_get_store, mock_build):
+        """Test a cached graph runs against the current checkpointer once the old one was replaced."""
+        from asgiref.sync import async_to_sync
+
+        from ai_ops.agents import deep_mcp_agent
+
+        store, first, second = object(), object(), object()
+        mock_get_store.return_value = store
+        mock_get_checkpointer.side_effect = [first, first, second]
+        mock_build.return_value = self._fake_graph(first, store)
+        llm_model = MagicMock(pk=1)
+
+        async def three_requests():
+            return [await deep_mcp_agent.get_deep_agent(llm_model=llm_model) for _ in range(3)]
+
+        graphs = async_to_sync(three_requests)()
+
+        self.assertIs(graphs[0], graphs[1])
+        self.assertIs(graphs[2].checkpointer, second)
+        self.assertEqual(mock_build.await_count, 1)
+
+    @patch("ai_ops.agents.deep_mcp_agent.build_deep_agent", new_callable=AsyncMock)
+    @patch("ai_ops.agents.deep_mcp_agent.get_store", new_callable=AsyncMock)
+    @patch("ai_ops.agents.deep_mcp_agent.get_checkpointer", new_callable=AsyncMock)
+    def test_cached_graph_reused_across_event_loops(self, mock_get_checkpointer, mock_get_store, mock_build):
+        """Test requests on separate event loops (as under WSGI) share one compiled graph."""
+        import asyncio
+
+        from asgiref.sync import async_to_sync
+
+        from ai_ops.agents import deep_mcp_agent
+
+        # The factories hand out new connections for every new event loop
+        connections = iter([(object(), object()), (object(), object())])
+        loop_connections = {}
+
+        async def connection(index):
+            loop = asyncio.get_running_loop()
+            if loop not in loop_connections:
+                loop_connections[loop] = next(connections)
+            return loop_connections[loop][index]
+
+        async def checkpointer(agent_name):
+            return await connection(0)
+
+        async def store(agent_name):
+            return await connection(1)
+
+        async def build(**kwargs):
+            return self._fake_graph(await connection(0), await connection(1))
+
+        mock_get_checkpointer.side_effect = checkpointer
+        mock_get_store.side_effect = store
+        mock_build.side_effect = build
+        get_deep_agent = async_to_sync(deep_mcp_agent.get_deep_agent)
+
+        first = get_deep_agent(llm_model=MagicMock(pk=1))
+        second = get_deep_agent(llm_model=MagicMock(pk=1))
+
+        self.assertEqual(mock_build.await_count, 1)
+        self.assertEqual(len(loop_connections), 2)
+        first_connections, second_connections = loop_connections.values()
+        self.assertEqual((first.checkpointer, first.store), first_connections)
+        self.assertEqual((second.checkpointer, second.store), second_connections)
+
+
+class MCPToolCatalogTestCase(TestCase):
+    """Test cases for the on-disk MCP tool catalog."""
+
+    def test_tool_catalog_round_trip_and_purge(self):
+        """Test saved tool definitions are rebuilt per server and purged on request."""
+        import tempfile
+        from datetime import datetime
+        from pathlib import Path
+
+        from ai_ops.helpers.mcp_tool_catalog import (
+            get_catalog_key,
+            load_tool_catalog,
+            purge_tool_catalog,
+            save_tool_catalog,
+        )
+
+        server_a = MagicMock(pk=1, url="http://a", mcp_endpoint="/mcp", last_updated=datetime(2025, 1, 1))
+        server_b = MagicMock(pk=2, url="http://b", mcp_endpoint="/mcp", last_updated=datetime(2025, 1, 1))
+        key = get_catalog_key([server_a, server_b])
+        self.assertEqual(key, get_catalog_key([server_b, server_a]))
+
+        tool = MagicMock(description="List devices", args_schema={"type": "object", "properties": {}})
+        tool.name = "list_devices"
+        connections = {"a": {"transport": "streamable_http", "url": "http://a/mcp"}}
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch("ai_ops.helpers.mcp_tool_catalog._get_catalog_dir", return_value=Path(tmp_dir)):
+                self.assertIsNone(load_tool_catalog(key, connections))
+                save_tool_catalog(key, {"a": [tool]})
+
+                tools = load_tool_catalog(key, connections)
+                self.assertEqual([t.name for t in tools], ["list_devices"])
+                self.assertEqual(tools[0].description, "List devices")
+                # A catalog that doesn't cover the requested servers is ignored
+                self.assertIsNone(load_tool_catalog(key, {**connections, "b": {}}))
+
+                purge_tool_catalog()
+                self.assertIsNone(load_tool_catalog(key, connections))
+
+
 class MiddlewareSchemaTestCase(TestCase):
     """Test cases for middleware schema helper functions."""
 
@@ -513,3 +805,84 @@ class GetActivePromptTestCase(TestCase):
         fresh_model = LLMModel.objects.get(pk=self.model.pk)
         result = get_active_prompt(fresh_model)
         self.assertIn("Loaded fresh from DB for helper test", result)
+
+    @patch("ai_ops.helpers.get_prompt.PROMPT_CACHE_SIZE", 2)
+    def test_prompt_cache_bounded_and_drops_expired_entries(self):
+        """Test the prompt cache evicts the least recently used and expired entries."""
+        from ai_ops.helpers import get_prompt
+
+        get_prompt.clear_prompt_cache()
+        self.addCleanup(get_prompt.clear_prompt_cache)
+
+        get_prompt._prompt_cache_set(("a",), "prompt a")
+        get_prompt._prompt_cache_set(("b",), "prompt b")
+        self.assertEqual(get_prompt._prompt_cache_get(("a",)), "prompt a")
+        get_prompt._prompt_cache_set(("c",), "prompt c")
+        self.assertEqual(list(get_prompt._prompt_cache), [("a",), ("c",)])
+
+        get_prompt._prompt_cache[("a",)] = (0.0, "expired prompt a")
+        self.assertIsNone(get_prompt._prompt_cache_get(("a",)))
+        self.assertNotIn(("a",), get_prompt._prompt_cache)
+
+    def test_get_cached_active_prompt_invalidated_on_prompt_save(self):
+        """Test cached prompts are reused until the SystemPrompt changes."""
+        import time
+
+        from ai_ops.helpers.get_prompt import clear_prompt_cache, get_cached_active_prompt
+        from ai_ops.models import SystemPrompt
+
+        clear_prompt_cache()
+        approved_status = self._get_approved_status()
+        unique_name = f"HelperTest_Cached_{int(time.time())}"
+        prompt, _ = SystemPrompt.objects.get_or_create(
+            name=unique_name,
+            version=1,
+            defaults={
+                "prompt_text": "Original cached prompt.",
+                "status": approved_status,
+            },
+        )
+        self.model.system_prompt = prompt
+        self.model.save()
+
+        self.assertIn("Original cached prompt", get_cached_active_prompt(self.model))
+
+        # Saving the prompt fires the invalidation signal
+        prompt.prompt_text = "Updated cached prompt."
+        prompt.save()
+        self.model.refresh_from_db()
+
+        self.assertIn("Updated cached prompt", get_cached_active_prompt(self.model))
+
+    def test_aget_active_prompt_matches_sync(self):
+        """Test aget_active_prompt returns the same prompt as the sync version."""
+        import time
+
+        from asgiref.sync import async_to_sync
+
+        from ai_ops.helpers.get_prompt import aget_active_prompt, get_active_prompt
+        from ai_ops.models import LLMModel, SystemPrompt
+
+        approved_status = self._get_approved_status()
+        unique_name = f"HelperTest_Async_{int(time.time())}"
+        prompt, _ = SystemPrompt.objects.get_or_create(
+            name=unique_name,
+            version=1,
+            defaults={
+                "prompt_text": "Async loaded prompt for {model_name}.",
+                "status": approved_status,
+            },
+        )
+        self.model.system_prompt = prompt
+        self.model.save()
+
+        # Without select_related the async path must query the prompt itself
+        fresh_model = LLMModel.objects.get(pk=self.model.pk)
+        result = async_to_sync(aget_active_prompt)(fresh_model)
+        self.assertEqual(result, get_active_prompt(self.model))
+        self.assertIn("Async loaded prompt for test-model", result)
+
+        # A select_related instance is reused without another query
+        preloaded_model = LLMModel.objects.select_related("system_prompt__status").get(pk=self.model.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(async_to_sync(aget_active_prompt)(preloaded_model), result)
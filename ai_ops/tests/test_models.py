@@ -1,5 +1,6 @@
 """Tests for AI Ops models."""
 
+from asgiref.sync import async_to_sync
 from django.core.exceptions import ValidationError
 from django.test import TestCase
 
@@ -78,6 +79,28 @@ class LLMModelTestCase(TestCase, TestDataMixin):
         self.assertEqual(default_model, self.model)
         self.assertTrue(default_model.is_default)
 
+    def test_llm_model_aget_default_model(self):
+        """Test aget_default_model matches get_default_model."""
+        default_model = async_to_sync(LLMModel.aget_default_model)()
+        self.assertEqual(default_model, self.model)
+        self.assertTrue(default_model.is_default)
+
+    def test_default_model_cache_cleared_on_save(self):
+        """Test the cached default model is refreshed after the model is saved."""
+        from ai_ops.helpers.get_llm_model import clear_default_model_cache, get_default_model_cached
+
+        clear_default_model_cache()
+        cached = async_to_sync(get_default_model_cached)()
+        self.assertEqual(cached, self.model)
+        self.assertIs(async_to_sync(get_default_model_cached)(), cached)
+
+        self.model.temperature = 0.5
+        self.model.save()
+
+        refreshed = async_to_sync(get_default_model_cached)()
+        self.assertIsNot(refreshed, cached)
+        self.assertEqual(refreshed.temperature, 0.5)
+
     def test_llm_model_only_one_default(self):
         """Test that only one model can be marked as default."""
         with self.assertRaises(ValidationError):
@@ -294,6 +317,11 @@ class MCPServerTestCase(TestCase, TestDataMixin):
         self.assertEqual(server.mcp_endpoint, "/mcp")
         self.assertEqual(server.health_check, "/health")
 
+    def test_mcp_server_full_mcp_url(self):
+        """Test that full_mcp_url joins the base URL and endpoint without a double slash."""
+        server = MCPServer(name="test-server", url="http://localhost:8000/", mcp_endpoint="/mcp")
+        self.assertEqual(server.full_mcp_url, "http://localhost:8000/mcp")
+
     def test_mcp_server_url_required(self):
         """Test that URL is required."""
         from nautobot.extras.models import Status
@@ -307,6 +335,20 @@ class MCPServerTestCase(TestCase, TestDataMixin):
             )
             server.clean()
 
+    def test_mcp_server_save_invalidates_caches_only_on_connection_change(self):
+        """Test only saves that change connection fields drop cached prompts and graphs."""
+        from unittest.mock import patch
+
+        with patch("ai_ops.signals.clear_prompt_cache") as mock_clear_prompt_cache:
+            self.server.description = "Only the description changed"
+            self.server.save()
+            self.server.save(update_fields=["description"])
+            mock_clear_prompt_cache.assert_not_called()
+
+            self.server.url = "http://localhost:9000"
+            self.server.save()
+            mock_clear_prompt_cache.assert_called_once()
+
 
 class SystemPromptTestCase(TestCase, TestDataMixin):
     """Test cases for SystemPrompt model."""
@@ -230,7 +230,7 @@ class AIChatBotGenericView(GenericView):
 
         except RuntimeError as e:
             if "cannot schedule new futures after interpreter shutdown" in str(e):
-                logger.warning(f"Cannot render chat view during interpreter shutdown: {e}")
+                logger.warning("Cannot render chat view during interpreter shutdown: %s", e)
                 # Use sync redirect with flash message - async context is unavailable
                 # Add flash message for user feedback using Django's messages framework
                 try:
@@ -241,7 +241,7 @@ class AIChatBotGenericView(GenericView):
                     )
                 except Exception as msg_err:
                     # If messages framework fails during shutdown, continue with redirect
-                    logger.debug(f"Could not add flash message during shutdown: {msg_err}")
+                    logger.debug("Could not add flash message during shutdown: %s", msg_err)
                 # Redirect to home page - graceful degradation
                 return HttpResponseRedirect("/")
             else:
@@ -292,12 +292,13 @@ class ChatMessageView(GenericView):
                         return JsonResponse(
                             {"error": f"Provider '{provider_override}' not found or is disabled"}, status=400
                         )
-                    logger.debug(f"Admin {request.user.username} selected provider: {provider_override}")
+                    logger.debug("Admin %s selected provider: %s", request.user.username, provider_override)
             elif request.POST.get("llm_provider"):
                 # Non-admin users cannot select provider
                 logger.warning(
-                    f"Non-admin user {request.user.username} attempted to select provider: "
-                    f"{request.POST.get('llm_provider')}"
+                    "Non-admin user %s attempted to select provider: %s",
+                    request.user.username,
+                    request.POST.get("llm_provider"),
                 )
                 return JsonResponse({"error": "Only administrators can select a specific provider"}, status=403)
 
@@ -320,12 +321,10 @@ class ChatMessageView(GenericView):
                 token = await sync_to_async(Token.objects.filter(user=request.user).first)()
                 if token:
                     user_token = token.key
-                    logger.info(
-                        f"[ChatMessageView] user={username} has_token=True token_length={len(user_token) if user_token else 0}"
-                    )
+                    logger.info("[ChatMessageView] user=%s has_token=True token_length=%d", username, len(user_token))
                 else:
                     logger.warning(
-                        f"[ChatMessageView] user={username} has_token=False - No API token found for user {username} - MCP tools may fail"
+                        "[ChatMessageView] user=%s has_token=False - No API token found - MCP tools may fail", username
                     )
             else:
                 logger.warning("[ChatMessageView] user=anonymous has_token=False - User not authenticated")
@@ -353,7 +352,7 @@ class ChatMessageView(GenericView):
             # Log full traceback for debugging
             import traceback
 
-            logger.error(f"Chat message error: {e!s}\n{traceback.format_exc()}")
+            logger.error("Chat message error: %s\n%s", e, traceback.format_exc())
 
             # Only hide exception details in NONPROD and PROD environments for security
             env = get_environment()
@@ -394,7 +393,7 @@ class ChatClearView(GenericView):
             # Works across multiple workers since it uses shared Redis backend
             # TODO: Enhance with interrupt support within graph execution
             set_cancellation_flag(thread_id)
-            logger.info(f"Cancellation requested for thread: {thread_id}")
+            logger.info("Cancellation requested for thread: %s", thread_id)
 
             # Import here to avoid circular dependencies
             from asgiref.sync import async_to_sync
@@ -416,13 +415,13 @@ class ChatClearView(GenericView):
         except RuntimeError as e:
             # Handle interpreter shutdown gracefully
             if "cannot schedule new futures after interpreter shutdown" in str(e):
-                logger.warning(f"Cannot clear conversation during shutdown: {str(e)}")
+                logger.warning("Cannot clear conversation during shutdown: %s", e)
                 return JsonResponse(
                     {"success": True, "message": "Server is shutting down, conversation will be cleared on restart"},
                     status=200,
                 )
             else:
-                logger.error(f"Runtime error clearing conversation: {str(e)}")
+                logger.error("Runtime error clearing conversation: %s", e)
                 # Only hide exception details in NONPROD and PROD environments for security
                 env = get_environment()
                 if env not in (NautobotEnvironment.NONPROD, NautobotEnvironment.PROD):
@@ -433,7 +432,7 @@ class ChatClearView(GenericView):
         except Exception as e:
             import traceback
 
-            logger.error(f"Failed to clear conversation: {str(e)}\n{traceback.format_exc()}")
+            logger.error("Failed to clear conversation: %s\n%s", e, traceback.format_exc())
 
             # Only hide exception details in NONPROD and PROD environments for security
             env = get_environment()
@@ -466,23 +465,23 @@ class ClearMCPCacheView(GenericView):
             from ai_ops.agents.multi_mcp_agent import clear_mcp_cache
 
             # Clear the cache using async_to_sync
-            cleared_count = async_to_sync(clear_mcp_cache)()
+            cleared_count = async_to_sync(clear_mcp_cache)(purge_catalog=True)
 
             # Log the action (system action, not an object change)
-            logger.info(f"User {request.user.username} cleared MCP client cache for {cleared_count} healthy servers")
+            logger.info("User %s cleared MCP client cache for %s healthy servers", request.user.username, cleared_count)
 
             return JsonResponse({"success": True, "cleared_count": cleared_count})
 
         except RuntimeError as e:
             # Handle interpreter shutdown gracefully
             if "cannot schedule new futures after interpreter shutdown" in str(e):
-                logger.warning(f"Cannot clear MCP cache during shutdown: {str(e)}")
+                logger.warning("Cannot clear MCP cache during shutdown: %s", e)
                 return JsonResponse(
                     {"success": True, "message": "Server is shutting down, cache will be cleared on restart"},
                     status=200,
                 )
             else:
-                logger.error(f"Runtime error clearing MCP cache: {str(e)}")
+                logger.error("Runtime error clearing MCP cache: %s", e)
                 env = get_environment()
                 if env not in (NautobotEnvironment.NONPROD, NautobotEnvironment.PROD):
                     error_message = f"Failed to clear cache: {str(e)}"
@@ -493,7 +492,7 @@ class ClearMCPCacheView(GenericView):
         except Exception as e:
             import traceback
 
-            logger.error(f"Failed to clear MCP cache: {str(e)}\n{traceback.format_exc()}")
+            logger.error("Failed to clear MCP cache: %s\n%s", e, traceback.format_exc())
 
             # Only hide exception details in NONPROD and PROD environments for security
             env = get_environment()